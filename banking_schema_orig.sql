@@ -18,12 +18,12 @@ CREATE TABLE branches (
 CREATE TABLE customers (
     id VARCHAR(50) PRIMARY KEY,
     email VARCHAR(255) UNIQUE NOT NULL,
-    phone VARCHAR(20),
+    phone VARCHAR(32),
     address VARCHAR(500),
     first_name VARCHAR(100) NOT NULL,
     last_name VARCHAR(100) NOT NULL,
     date_of_birth DATE,
-    gender VARCHAR(10),
+    gender VARCHAR(20),
     national_id VARCHAR(50) UNIQUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
@@ -37,7 +37,7 @@ CREATE TABLE employees (
     branch_id VARCHAR(50) NOT NULL,
     name VARCHAR(255) NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
-    phone VARCHAR(20),
+    phone VARCHAR(32),
     position VARCHAR(100),
     hire_date DATE,
     salary DECIMAL(15,2),
@@ -0,0 +1,305 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from load_banking_data import bulk_load, load_schema_and_data
+
+# load_banking_data puts data/ on sys.path
+from banking_test_data_generator import (  # noqa: E402
+    BankingDataGenerator, DEFAULT_CHUNK_SIZE, DEFAULT_COUNTS, SQL_OUTPUTS, TABLES,
+    ExcelSheetWriter, chunk_length, make_sql_writer, peak_rss_bytes,
+)
+
+# Stages in the order they run; "load" replays the INSERT file written by "sql"
+STAGES = ["generate", "sql", "excel", "load", "bulk_load"]
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+# Generator methods that produce each table, timed individually in the "generate" stage
+GENERATE_METHODS = {
+    "branches": ["generate_branches"],
+    "employees": ["generate_employees"],
+    "customers": ["generate_customers"],
+    "accounts": ["generate_accounts", "generate_accounts_vectorized"],
+    "transactions": ["generate_transactions", "generate_transactions_vectorized"],
+}
+
+# Metrics compared against a baseline: (key, True if higher is better)
+COMPARED_METRICS = [("rows_per_sec", True), ("peak_rss_bytes", False)]
+
+def scaled_counts(transactions):
+    """Row counts for a run with the given number of transactions.
+
+    Customers and accounts keep their DEFAULT_COUNTS ratio to transactions;
+    branches and employees are small dimension tables and stay fixed.
+    """
+    scale = transactions / DEFAULT_COUNTS["transactions"]
+    counts = {table: DEFAULT_COUNTS[table] for table in ["branches", "employees"]}
+    for table in ["customers", "accounts"]:
+        counts[table] = max(1, round(DEFAULT_COUNTS[table] * scale))
+    counts["transactions"] = transactions
+    return counts
+
+def reset_peak_rss():
+    """Reset the process's peak RSS (Linux only); returns False if it cannot be reset"""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+def path_bytes(path):
+    """Size of a file, or of all files under a directory"""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def table_stat(rows, seconds=None, output_bytes=None):
+    """Per-table result; seconds is None when a stage cannot time tables separately"""
+    return {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else None,
+            "output_bytes": output_bytes}
+
+class TimedWriter:
+    """Wrap a generator writer, timing each table and measuring its output bytes"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.rows = {}
+        self.seconds = {}
+        self.output_bytes = {}
+
+    def _position(self):
+        # Single-file writers expose the open file; tell() flushes the buffer first
+        file = getattr(self.writer, "file", None)
+        return file.tell() if file is not None else None
+
+    def write(self, table, chunk):
+        before = self._position()
+        started = time.perf_counter()
+        self.writer.write(table, chunk)
+        self.seconds[table] = self.seconds.get(table, 0.0) + time.perf_counter() - started
+        self.rows[table] = self.rows.get(table, 0) + chunk_length(chunk)
+        if before is not None:
+            self.output_bytes[table] = self.output_bytes.get(table, 0) + self._position() - before
+
+    def close(self):
+        self.writer.close()
+
+    def tables(self):
+        return {table: table_stat(self.rows[table], self.seconds[table], self.output_bytes.get(table))
+                for table in self.rows}
+
+@contextlib.contextmanager
+def timed_generate_methods(generator, seconds):
+    """Time the generator's per-table methods while generate_all_data calls them"""
+    def timed(table, method):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[table] = seconds.get(table, 0.0) + time.perf_counter() - started
+        return wrapper
+
+    for table, names in GENERATE_METHODS.items():
+        for name in names:
+            setattr(generator, name, timed(table, getattr(generator, name)))
+    try:
+        yield
+    finally:
+        for names in GENERATE_METHODS.values():
+            for name in names:
+                delattr(generator, name)
+
+class BenchmarkRun:
+    """Run the stages for one transaction count, collecting one result per stage"""
+
+    def __init__(self, transactions, workdir, args):
+        self.transactions = transactions
+        self.counts = scaled_counts(transactions)
+        self.workdir = workdir
+        self.args = args
+        self.generator = None
+        self.results = []
+
+    def _measure(self, stage, run):
+        """Run one stage with a fresh peak RSS; run() returns (per-table stats, output path or None)"""
+        reset_peak_rss()
+        capture = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if self.args.verbose else capture):
+            tables, output = run()
+        seconds = time.perf_counter() - started
+        rows = sum(stat["rows"] for table, stat in tables.items() if table in TABLES)
+        result = {
+            "transactions": self.transactions,
+            "stage": stage,
+            "seconds": seconds,
+            "rows": rows,
+            "rows_per_sec": rows / seconds if seconds else 0.0,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "output_bytes": path_bytes(output) if output else None,
+            "tables": tables,
+        }
+        self.results.append(result)
+        print_result(result)
+        return result
+
+    def _generator(self):
+        return BankingDataGenerator(seed=self.args.seed, reference_time=self.args.reference_time,
+                                    pool_cache_dir=self.args.pool_cache)
+
+    def generate(self):
+        self.generator = self._generator()
+        # The Faker value pools are built once, not per table: time them as their own entry
+        started = time.perf_counter()
+        self.generator.get_value_pools()
+        pool_seconds = time.perf_counter() - started
+        seconds = {}
+        with timed_generate_methods(self.generator, seconds):
+            self.generator.generate_all_data(vectorized=not self.args.row_path, compact=not self.args.row_path,
+                                             counts=self.counts)
+        tables = {table: table_stat(self.generator.count_records(table), seconds.get(table, 0.0)) for table in TABLES}
+        return {**tables, "value_pools": {"seconds": pool_seconds}}, None
+
+    def sql(self):
+        path = os.path.join(self.workdir, SQL_OUTPUTS[self.args.sql_format])
+        writer = TimedWriter(make_sql_writer(self.args.sql_format, path, self.args.batch_size))
+        self.generator.write_tables(writer)
+        return writer.tables(), path
+
+    def excel(self):
+        path = os.path.join(self.workdir, "banking_test_data.xlsx")
+        writer = TimedWriter(ExcelSheetWriter(path))
+        self.generator.write_tables(writer)
+        return writer.tables(), path
+
+    def load(self):
+        load_schema_and_data(self.args.schema, os.path.join(self.workdir, SQL_OUTPUTS["insert"]))
+        # executescript runs the whole file at once, so tables are not timed separately
+        return {table: table_stat(self.counts[table]) for table in TABLES}, None
+
+    def bulk_load(self):
+        path = os.path.join(self.workdir, "banking_test_data.db")
+        if os.path.exists(path):
+            os.remove(path)
+        conn, stats = bulk_load(path, self.args.schema, self._generator(), self.counts, self.args.chunk_size,
+                                self.args.workers)
+        conn.close()
+        tables = {table: table_stat(stats[table]["rows"], stats[table]["seconds"]) for table in TABLES}
+        return {**tables, "indexes": stats["indexes"]}, path
+
+    def run(self, stages):
+        print(f"\n== {self.transactions} transactions ({', '.join(f'{t}={n}' for t, n in self.counts.items())})")
+        for stage in stages:
+            if stage in ("sql", "excel") and self.generator is None:
+                self._measure("generate", self.generate)
+            if stage == "load" and not os.path.exists(os.path.join(self.workdir, SQL_OUTPUTS["insert"])):
+                raise SystemExit("The load stage replays INSERT statements: run it after --stages sql "
+                                 "with --sql-format insert")
+            self._measure(stage, getattr(self, stage))
+        self.generator = None
+        return self.results
+
+def print_result(result):
+    rss = f"{result['peak_rss_bytes'] / 2**20:10.1f}" if result["peak_rss_bytes"] is not None else f"{'-':>10}"
+    output = f"{result['output_bytes'] / 2**20:10.1f}" if result["output_bytes"] is not None else f"{'-':>10}"
+    print(f"{result['stage']:<10}{result['rows']:>12}{result['seconds']:>10.2f}{result['rows_per_sec']:>14,.0f}"
+          f"{rss}{output}")
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Print each stage's change against the baseline; return the regressions beyond tolerance"""
+    previous = {(r["transactions"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'Stage':<22}{'Metric':<16}{'Baseline':>16}{'Current':>16}{'Change':>9}")
+    for result in results:
+        key = (result["transactions"], result["stage"])
+        if key not in previous:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = previous[key][metric], result[metric]
+            if not old:
+                continue
+            change = new / old - 1
+            regressed = -change > tolerance if higher_is_better else change > tolerance
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{result['stage'] + ' @ ' + str(result['transactions']):<22}{metric:<16}"
+                  f"{old:>16,.0f}{new:>16,.0f}{change:>+9.1%}{flag}")
+            if regressed:
+                regressions.append((key, metric, change))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark banking test data generation, serialization and loading")
+    parser.add_argument("--sizes", type=lambda value: [int(n) for n in value.split(",")], default=DEFAULT_SIZES,
+                        help="comma-separated transaction counts, e.g. 10000,100000,1000000,10000000")
+    parser.add_argument("--stages", type=lambda value: value.split(","), default=STAGES,
+                        help=f"comma-separated stages to run, from {','.join(STAGES)}")
+    parser.add_argument("--row-path", action="store_true",
+                        help="generate row dicts instead of vectorized compact columns (slow at large sizes)")
+    parser.add_argument("--sql-format", choices=list(SQL_OUTPUTS), default="insert")
+    parser.add_argument("--batch-size", type=int, default=1, help="rows per INSERT statement")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per bulk load batch")
+    parser.add_argument("--workers", type=int, default=1, help="generator processes for bulk_load")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reference-time", type=datetime.fromisoformat, default=datetime(2025, 1, 1),
+                        help="fixed 'now' so every run generates the same data")
+    parser.add_argument("--pool-cache", help="value pool cache directory (keeps Faker out of the timings)")
+    parser.add_argument("--schema", default="banking_schema_orig.sql")
+    parser.add_argument("--workdir", help="directory for output files (default: a temporary directory)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative slowdown or RSS growth against the baseline that counts as a regression")
+    parser.add_argument("--verbose", action="store_true", help="show the generator's progress output")
+    args = parser.parse_args()
+
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    if "load" in args.stages and args.sql_format != "insert":
+        parser.error("the load stage needs --sql-format insert")
+    stages = [stage for stage in STAGES if stage in args.stages]
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="banking_benchmark_")
+    os.makedirs(workdir, exist_ok=True)
+    if not reset_peak_rss():
+        print("Peak RSS cannot be reset on this platform: values are process-wide high-water marks")
+    print(f"{'Stage':<10}{'Rows':>12}{'Seconds':>10}{'Rows/sec':>14}{'Peak MB':>10}{'Out MB':>10}")
+    results = []
+    try:
+        for transactions in args.sizes:
+            results.extend(BenchmarkRun(transactions, workdir, args).run(stages))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "options": {"seed": args.seed, "row_path": args.row_path, "sql_format": args.sql_format,
+                    "batch_size": args.batch_size, "chunk_size": args.chunk_size, "workers": args.workers},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(report, out, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare_to_baseline(results, json.load(baseline), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            sys.exit(1)
@@ -0,0 +1,281 @@
+import argparse
+import re
+from collections import namedtuple
+
+DIALECTS = ["sqlite", "postgres", "mysql"]
+
+Column = namedtuple("Column", "name type not_null unique primary_key default on_update")
+ForeignKey = namedtuple("ForeignKey", "name table column ref_table ref_column")
+Check = namedtuple("Check", "name table expression")
+Index = namedtuple("Index", "name table columns unique include where")
+Table = namedtuple("Table", "name columns")
+
+# Schema parsed into tables plus the constraints and indexes that can be built after a load
+Schema = namedtuple("Schema", "tables foreign_keys checks indexes")
+
+# Compiled DDL: "tables" runs before the load, "deferred" (indexes, constraints, triggers) after it.
+# "validations" are queries returning (constraint, violating rows) for constraints a dialect
+# cannot check against rows that are already loaded.
+CompiledSchema = namedtuple("CompiledSchema", "tables deferred validations")
+
+# Optional indexes for hot queries: an account's completed transactions by date and the
+# oldest pending transactions (partial indexes), and an account statement or customer
+# overview answered from the index alone (covering)
+HOT_INDEXES = [
+    Index("idx_transactions_completed", "transactions", ["account_id", "transaction_date"], False,
+          [], "status = 'completed'"),
+    Index("idx_transactions_pending", "transactions", ["transaction_date"], False, [], "status = 'pending'"),
+    Index("idx_transactions_statement", "transactions", ["account_id", "transaction_date"], False,
+          ["amount", "type", "status"], None),
+    Index("idx_accounts_customer_overview", "accounts", ["customer_id"], False,
+          ["type", "status", "balance"], None),
+]
+
+_COLUMN = re.compile(r"(\w+)\s+(\w+(?:\s*\([\d\s,]+\))?)(.*)", re.DOTALL)
+_DEFAULT = re.compile(r"\bDEFAULT\s+('[^']*'|[\w.]+)", re.IGNORECASE)
+_FOREIGN_KEY = re.compile(r"(?:CONSTRAINT\s+(\w+)\s+)?FOREIGN\s+KEY\s*\((\w+)\)\s*REFERENCES\s+(\w+)\s*\((\w+)\)",
+                          re.IGNORECASE)
+_ALTER = re.compile(r"ALTER\s+TABLE\s+(\w+)\s+ADD\s+CONSTRAINT\s+(\w+)\s+(.*)", re.IGNORECASE | re.DOTALL)
+_CHECK = re.compile(r"CHECK\s*\((.*)\)", re.IGNORECASE | re.DOTALL)
+_INDEX = re.compile(r"CREATE\s+(UNIQUE\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+_CREATE_TABLE = re.compile(r"CREATE\s+TABLE\s+(\w+)\s*\((.*)\)", re.IGNORECASE | re.DOTALL)
+
+def _split_top_level(text):
+    """Split on commas outside parentheses"""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+def _parse_column(definition):
+    name, column_type, rest = _COLUMN.match(definition).groups()
+    upper = rest.upper()
+    default = _DEFAULT.search(rest)
+    return Column(
+        name=name,
+        type=re.sub(r"\s+", "", column_type.upper()),
+        not_null="NOT NULL" in upper,
+        unique=re.search(r"\bUNIQUE\b", upper) is not None,
+        primary_key="PRIMARY KEY" in upper,
+        default=default.group(1) if default else None,
+        on_update="ON UPDATE CURRENT_TIMESTAMP" in re.sub(r"\s+", " ", upper),
+    )
+
+def parse_schema(schema_sql):
+    """Parse the MySQL-flavoured schema script into a Schema.
+
+    Understands what banking_schema_orig.sql uses: CREATE TABLE with column
+    and FOREIGN KEY definitions, ALTER TABLE ... ADD CONSTRAINT for foreign
+    keys and CHECKs, and CREATE [UNIQUE] INDEX.
+    """
+    schema_sql = re.sub(r"--[^\n]*", "", schema_sql)
+    schema = Schema([], [], [], [])
+    for statement in schema_sql.split(";"):
+        statement = statement.strip()
+        if not statement:
+            continue
+        create = _CREATE_TABLE.match(statement)
+        alter = _ALTER.match(statement)
+        index = _INDEX.match(statement)
+        if create:
+            name, body = create.groups()
+            columns = []
+            for definition in _split_top_level(body):
+                foreign_key = _FOREIGN_KEY.match(definition)
+                if foreign_key:
+                    fk_name, column, ref_table, ref_column = foreign_key.groups()
+                    schema.foreign_keys.append(
+                        ForeignKey(fk_name or f"fk_{name}_{column}", name, column, ref_table, ref_column))
+                else:
+                    columns.append(_parse_column(definition))
+            schema.tables.append(Table(name, columns))
+        elif alter:
+            table, name, constraint = alter.groups()
+            foreign_key = _FOREIGN_KEY.match(constraint)
+            check = _CHECK.match(constraint.strip())
+            if foreign_key:
+                _, column, ref_table, ref_column = foreign_key.groups()
+                schema.foreign_keys.append(ForeignKey(name, table, column, ref_table, ref_column))
+            elif check:
+                schema.checks.append(Check(name, table, " ".join(check.group(1).split())))
+            else:
+                raise ValueError(f"Unsupported constraint: {statement}")
+        elif index:
+            unique, name, table, columns = index.groups()
+            schema.indexes.append(Index(name, table, [c.strip() for c in columns.split(",")], bool(unique),
+                                        [], None))
+        else:
+            raise ValueError(f"Unsupported statement: {statement}")
+    return schema
+
+def column_type(column_type, dialect):
+    """Dialect spelling of a column type from the MySQL schema"""
+    base = column_type.split("(")[0]
+    if dialect == "sqlite":
+        # SQLite type affinity: VARCHAR lengths are not enforced and DECIMAL has NUMERIC affinity anyway
+        return {"VARCHAR": "TEXT", "CHAR": "TEXT", "DECIMAL": "NUMERIC"}.get(base, column_type)
+    if dialect == "postgres" and base == "DECIMAL":
+        return "NUMERIC" + column_type[len(base):]
+    return column_type
+
+def _column_sql(column, dialect):
+    parts = [column.name, column_type(column.type, dialect)]
+    if column.primary_key:
+        parts.append("PRIMARY KEY")
+    if column.not_null:
+        parts.append("NOT NULL")
+    if column.default is not None:
+        parts.append(f"DEFAULT {column.default}")
+    if column.on_update and dialect == "mysql":
+        parts.append("ON UPDATE CURRENT_TIMESTAMP")
+    return " ".join(parts)
+
+def _foreign_key_sql(foreign_key):
+    return (f"CONSTRAINT {foreign_key.name} FOREIGN KEY ({foreign_key.column}) "
+            f"REFERENCES {foreign_key.ref_table}({foreign_key.ref_column})")
+
+def _index_sql(index, dialect):
+    columns = list(index.columns)
+    include, where = "", ""
+    if index.include:
+        if dialect == "postgres":
+            include = f" INCLUDE ({', '.join(index.include)})"
+        else:
+            # No INCLUDE clause: carry the payload columns as trailing key columns
+            columns += index.include
+    if index.where:
+        if dialect == "mysql":
+            # No partial indexes: lead with the filtered column instead
+            columns.insert(0, re.match(r"\s*(\w+)", index.where).group(1))
+        else:
+            where = f" WHERE {index.where}"
+    unique = "UNIQUE " if index.unique else ""
+    return f"CREATE {unique}INDEX {index.name} ON {index.table}({', '.join(columns)}){include}{where}"
+
+def _updated_at_triggers(table, dialect):
+    """Triggers that emulate MySQL's ON UPDATE CURRENT_TIMESTAMP"""
+    key = next(column.name for column in table.columns if column.primary_key)
+    statements = []
+    for column in table.columns:
+        if not column.on_update:
+            continue
+        trigger = f"trg_{table.name}_{column.name}"
+        if dialect == "sqlite":
+            statements.append(
+                f"CREATE TRIGGER {trigger} AFTER UPDATE ON {table.name} FOR EACH ROW "
+                f"WHEN NEW.{column.name} IS OLD.{column.name} BEGIN "
+                f"UPDATE {table.name} SET {column.name} = CURRENT_TIMESTAMP WHERE {key} = NEW.{key}; END")
+        elif dialect == "postgres":
+            statements.append(f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table.name} FOR EACH ROW "
+                              f"EXECUTE FUNCTION set_{column.name}()")
+    return statements
+
+def _new_row_expression(expression, columns):
+    """Qualify the column references of a CHECK expression with NEW. for a trigger's WHEN clause"""
+    pattern = re.compile(r"\b(" + "|".join(column.name for column in columns) + r")\b")
+    # Leave string literals alone
+    parts = re.split(r"('(?:[^']|'')*')", expression)
+    return "".join(part if part.startswith("'") else pattern.sub(r"NEW.\1", part) for part in parts)
+
+def _check_triggers(check, table):
+    """SQLite triggers enforcing a CHECK on rows written after they are created"""
+    condition = _new_row_expression(check.expression, table.columns)
+    return [f"CREATE TRIGGER {check.name}_{event.lower()} BEFORE {event} ON {check.table} FOR EACH ROW "
+            f"WHEN NOT ({condition}) BEGIN SELECT RAISE(ABORT, 'CHECK constraint failed: {check.name}'); END"
+            for event in ["INSERT", "UPDATE"]]
+
+def _updated_at_functions(schema):
+    """PostgreSQL trigger functions (one per ON UPDATE column name) used by _updated_at_triggers"""
+    names = sorted({column.name for table in schema.tables for column in table.columns if column.on_update})
+    return [f"CREATE OR REPLACE FUNCTION set_{name}() RETURNS trigger AS $$ "
+            f"BEGIN NEW.{name} = CURRENT_TIMESTAMP; RETURN NEW; END $$ LANGUAGE plpgsql" for name in names]
+
+def compile_schema(schema_sql, dialect="sqlite", hot_indexes=False):
+    """Compile a schema script into CompiledSchema(tables, deferred, validations) for a dialect.
+
+    The tables phase only creates tables with their primary keys. Unique
+    constraints, the idx_* indexes (plus HOT_INDEXES if hot_indexes), CHECKs
+    and ON UPDATE triggers are deferred so a bulk load does no per-row
+    index maintenance or constraint evaluation. PostgreSQL and MySQL add
+    foreign keys and CHECKs with ALTER TABLE, which validates loaded rows.
+    SQLite cannot add constraints to an existing table: its foreign keys
+    stay in CREATE TABLE (only enforced with PRAGMA foreign_keys = ON), and
+    its CHECKs become insert/update triggers plus validation queries for
+    the rows loaded before the triggers existed.
+    """
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unknown dialect {dialect!r}")
+    schema = parse_schema(schema_sql)
+    tables, deferred, validations = [], [], []
+    for table in schema.tables:
+        definitions = [_column_sql(column, dialect) for column in table.columns]
+        if dialect == "sqlite":
+            definitions += [_foreign_key_sql(foreign_key)
+                            for foreign_key in schema.foreign_keys if foreign_key.table == table.name]
+        tables.append(f"CREATE TABLE {table.name} (\n    " + ",\n    ".join(definitions) + "\n)")
+
+    for table in schema.tables:
+        for column in table.columns:
+            if not column.unique:
+                continue
+            name = f"uq_{table.name}_{column.name}"
+            if dialect == "sqlite":
+                deferred.append(f"CREATE UNIQUE INDEX {name} ON {table.name}({column.name})")
+            else:
+                deferred.append(f"ALTER TABLE {table.name} ADD CONSTRAINT {name} UNIQUE ({column.name})")
+    indexes = schema.indexes + (HOT_INDEXES if hot_indexes else [])
+    deferred += [_index_sql(index, dialect) for index in indexes]
+    if dialect == "sqlite":
+        tables_by_name = {table.name: table for table in schema.tables}
+        for check in schema.checks:
+            deferred += _check_triggers(check, tables_by_name[check.table])
+            validations.append(f"SELECT '{check.name}', COUNT(*) FROM {check.table} WHERE NOT ({check.expression})")
+    else:
+        deferred += [f"ALTER TABLE {check.table} ADD CONSTRAINT {check.name} CHECK ({check.expression})"
+                     for check in schema.checks]
+        deferred += [f"ALTER TABLE {foreign_key.table} ADD {_foreign_key_sql(foreign_key)}"
+                     for foreign_key in schema.foreign_keys]
+    if dialect == "postgres":
+        deferred += _updated_at_functions(schema)
+    for table in schema.tables:
+        deferred += _updated_at_triggers(table, dialect)
+    return CompiledSchema(tables, deferred, validations)
+
+def render_script(compiled, phases=("tables", "deferred", "validations")):
+    """The compiled statements as a runnable script, one section per phase"""
+    titles = {"tables": "Tables (run before loading data)",
+              "deferred": "Indexes, constraints and triggers (run after loading data)",
+              "validations": "Constraint checks of the loaded rows (every count must be 0)"}
+    sections = []
+    for phase in phases:
+        statements = getattr(compiled, phase)
+        if not statements:
+            continue
+        sections.append(f"-- {titles[phase]}\n" + "".join(f"{statement};\n\n" for statement in statements))
+    return "\n".join(sections)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the banking schema into dialect-specific DDL")
+    parser.add_argument("--schema", default="banking_schema_orig.sql", help="MySQL-flavoured schema script")
+    parser.add_argument("--dialect", choices=DIALECTS, default="sqlite")
+    parser.add_argument("--phase", choices=["tables", "deferred", "validations", "all"], default="all",
+                        help="only the tables phase, the deferred (post-load) phase or the validation queries")
+    parser.add_argument("--hot-indexes", action="store_true",
+                        help="add covering and partial indexes for frequent queries")
+    parser.add_argument("--output", help="write the DDL to this file instead of stdout")
+    args = parser.parse_args()
+
+    with open(args.schema, "r") as schema:
+        compiled = compile_schema(schema.read(), args.dialect, args.hot_indexes)
+    script = render_script(compiled, ("tables", "deferred", "validations") if args.phase == "all" else (args.phase,))
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(script)
+    else:
+        print(script, end="")
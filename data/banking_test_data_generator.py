@@ -1,31 +1,800 @@
+import argparse
+import bisect
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
 import random
 import string
-import pandas as pd
+import sys
+import threading
+import time
+from collections import Counter, deque
 from datetime import datetime, timedelta, date
 from faker import Faker
 import uuid
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill
 import numpy as np
 
-# Initialize Faker
-fake = Faker()
 
-# Set seed for reproducible results
-random.seed(42)
-fake.seed_instance(42)
+# Categorical domains (kept in sync with the CHECK constraints in the schema)
+ACCOUNT_TYPES = ['checking', 'savings', 'credit', 'loan']
+ACCOUNT_STATUSES = ['active', 'inactive', 'closed', 'suspended']
+TRANSACTION_TYPES = ['deposit', 'withdrawal', 'transfer', 'fee', 'interest']
+TRANSACTION_STATUSES = ['pending', 'completed', 'failed', 'cancelled']
+GENDERS = ['male', 'female', 'other', 'prefer_not_to_say']
 
-class BankingDataGenerator:
+# (low, high) balance range per account type, in ACCOUNT_TYPES order
+BALANCE_RANGES = np.array([
+    [-1000, 50000],     # checking
+    [0, 100000],        # savings
+    [-10000, 0],        # credit
+    [-50000, 0],        # loan
+], dtype=np.float64)
+
+# (low, high) amount range per transaction type, in TRANSACTION_TYPES order
+AMOUNT_RANGES = np.array([
+    [10, 10000],        # deposit
+    [-5000, -1],        # withdrawal
+    [-2000, 2000],      # transfer
+    [-100, -1],         # fee
+    [0.01, 500],        # interest
+], dtype=np.float64)
+
+# Lowest running balance each account type may reach in ledger mode: the checking
+# overdraft limit, no overdraft on savings, the credit limit and the loan principal
+LEDGER_FLOORS = BALANCE_RANGES[:, 0]
+
+# Transaction that opens an account's ledger, per account type: an opening deposit
+# (checking, savings), a first purchase (credit) or the disbursement (loan)
+OPENING_TYPES = np.array([0, 0, 2, 2])  # TRANSACTION_TYPES codes: deposit, deposit, transfer, transfer
+OPENING_RANGES = np.array([
+    [100, 5000],        # checking
+    [100, 5000],        # savings
+    [-2000, -100],      # credit
+    [-50000, -1000],    # loan
+], dtype=np.float64)
+
+# Tables in load (foreign key) order
+TABLES = ['branches', 'employees', 'customers', 'accounts', 'transactions']
+
+# Column order of each table, as in banking_schema_orig.sql
+TABLE_COLUMNS = {
+    'branches': ['id', 'name', 'address', 'city', 'state', 'zip_code', 'manager_id', 'created_at', 'updated_at'],
+    'employees': ['id', 'branch_id', 'name', 'email', 'phone', 'position', 'hire_date', 'salary',
+                  'created_at', 'updated_at'],
+    'customers': ['id', 'email', 'phone', 'address', 'first_name', 'last_name', 'date_of_birth', 'gender',
+                  'national_id', 'created_at', 'updated_at', 'branch_id'],
+    'accounts': ['id', 'customer_id', 'account_number', 'type', 'balance', 'opened_at', 'interest_rate',
+                 'status', 'branch_id', 'created_at', 'updated_at'],
+    'transactions': ['id', 'account_id', 'transaction_date', 'amount', 'type', 'description', 'status',
+                     'created_at', 'updated_at', 'employee_id'],
+}
+
+# Default output of each generate_sql_inserts mode (csv writes one file per table into a directory)
+SQL_OUTPUTS = {'insert': 'banking_test_data_new.sql', 'copy': 'banking_test_data_copy.sql',
+               'csv': 'banking_test_data_csv'}
+
+# Files written by ColumnarFileWriter, one per table
+COLUMNAR_FORMATS = ['parquet', 'arrow']
+
+# Data rows that fit on one Excel sheet below the header row
+EXCEL_MAX_DATA_ROWS = 1048575
+
+# Buffer size for the text writers
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Default row counts per table
+DEFAULT_COUNTS = {'branches': 50, 'employees': 500, 'customers': 2000, 'accounts': 3000, 'transactions': 15000}
+
+# Rows per chunk for the streaming generators
+DEFAULT_CHUNK_SIZE = 100000
+
+# Number of distinct transaction descriptions sampled by the vectorized generator
+DESCRIPTION_POOL_SIZE = 1024
+
+# Number of values drawn from Faker for each of the other value pools
+VALUE_POOL_SIZE = 4096
+
+# Seconds between two progress events of the same table
+DEFAULT_PROGRESS_SECONDS = 5.0
+
+# Profilers Telemetry can capture a run with
+PROFILERS = ['cprofile', 'sample']
+
+# Tables that grow in incremental batches, in foreign key order
+DELTA_TABLES = ['customers', 'accounts', 'transactions']
+
+
+def _format_ids(prefix, start, count, width=10):
+    """Format sequential ids as fixed-width byte strings, e.g. b'TXN0000000001'"""
+    seq = np.arange(start, start + count, dtype=np.int64)
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    buf = np.empty((count, len(prefix) + width), dtype=np.uint8)
+    buf[:, :len(prefix)] = np.frombuffer(prefix.encode('ascii'), dtype=np.uint8)
+    buf[:, len(prefix):] = (seq[:, None] // powers) % 10 + ord('0')
+    return buf.view(f'S{len(prefix) + width}').ravel()
+
+
+def _national_id(i):
+    """SSN-formatted national id that is unique per customer row index"""
+    n = 100000000 + i  # Area numbers start at 100, never 000
+    return f"{n // 1000000:03d}-{n // 10000 % 100:02d}-{n % 10000:04d}"
+
+
+def _random_datetimes(rng, start, end):
+    """Draw uniform datetime64[s] values between start and end (element-wise)"""
+    start = np.asarray(start, dtype='datetime64[s]')
+    span = (np.asarray(end, dtype='datetime64[s]') - start).astype(np.int64)
+    offsets = (rng.random(np.broadcast(start, span).shape) * span).astype(np.int64)
+    return start + offsets.astype('timedelta64[s]')
+
+
+def _grouped_cumsum(values, starts):
+    """Cumulative sum restarting at each group start (groups are contiguous runs of rows)"""
+    total = np.cumsum(values)
+    sizes = np.diff(np.append(starts, len(values)))
+    return total - np.repeat(total[starts] - values[starts], sizes)
+
+
+def _grouped_cummax(values, group):
+    """Running maximum of non-negative integers restarting with each group (ascending group ids).
+    
+    Each group is lifted above the previous ones, so a single maximum.accumulate
+    never carries a maximum across a group boundary.
+    """
+    offsets = group.astype(np.int64) * (int(values.max(initial=0)) + 1)
+    return np.maximum.accumulate(values + offsets) - offsets
+
+
+def _as_datetime(value):
+    """Promote a date to midnight of that day (datetimes pass through)"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+def _random_datetime(rnd, start, end):
+    """Uniform whole-second datetime between start and end (dates count from midnight)"""
+    start = _as_datetime(start)
+    span = int((_as_datetime(end) - start).total_seconds())
+    return start + timedelta(seconds=rnd.randint(0, max(span, 0)))
+
+
+def _random_date(rnd, start, end):
+    """Uniform date between the days of start and end"""
+    start = _as_datetime(start).date()
+    span = (_as_datetime(end).date() - start).days
+    return start + timedelta(days=rnd.randint(0, max(span, 0)))
+
+
+class DictionaryColumn:
+    """Dictionary-encoded column: small integer codes into an array of distinct values.
+    
+    Used for low-cardinality text (types, statuses, names, pooled descriptions)
+    so each row costs one or two bytes instead of an 8-byte object reference.
+    """
+    __slots__ = ('codes', 'values')
+    
+    def __init__(self, codes, values):
+        self.codes = codes
+        self.values = values
+    
+    @classmethod
+    def encode(cls, items):
+        """Dictionary-encode a sequence of hashable Python values (None allowed)"""
+        positions = {}
+        codes = [positions.setdefault(item, len(positions)) for item in items]
+        values = np.empty(len(positions), dtype=object)
+        values[:] = list(positions)
+        return cls(np.array(codes, dtype=_code_dtype(len(values))), values)
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def __getitem__(self, key):
+        return DictionaryColumn(self.codes[key], self.values)
+    
+    def decode(self):
+        """The column as a plain object array"""
+        return self.values[self.codes]
+
+
+def _code_dtype(cardinality):
+    """Smallest unsigned integer type able to hold codes for the given number of values"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if cardinality <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.int64
+
+
+# Columns stored as fixed-width ASCII bytes when compacting row dicts (b'' is NULL)
+BYTES_COLUMNS = {'id', 'branch_id', 'manager_id', 'customer_id', 'account_id', 'employee_id',
+                 'account_number', 'national_id', 'zip_code'}
+
+
+def _compact_column(name, items):
+    """Store one column of row values in its most compact array form"""
+    sample = next((item for item in items if item is not None), None)
+    if name in BYTES_COLUMNS:
+        return np.array([item or '' for item in items], dtype='S')
+    if isinstance(sample, datetime):
+        # Generated timestamps are whole seconds; keep microseconds only if a value has them
+        fractional = any(item is not None and item.microsecond for item in items)
+        return np.array(items, dtype='datetime64[us]' if fractional else 'datetime64[s]')
+    if isinstance(sample, date):
+        return np.array(items, dtype='datetime64[D]')
+    if isinstance(sample, (int, float)):
+        return np.array([np.nan if item is None else item for item in items], dtype=np.float64)
+    # Text: dictionary-encode when values repeat, otherwise keep the strings as they are
+    column = DictionaryColumn.encode(items)
+    if 2 * len(column.values) <= len(items):
+        return column
+    values = np.empty(len(items), dtype=object)
+    values[:] = items
+    return values
+
+
+def records_to_columns(table, rows):
+    """Convert row dicts to compact columns in TABLE_COLUMNS order.
+    
+    Ids become fixed-width byte strings, timestamps int64-backed datetime64,
+    numbers float64 (NaN for NULL) and repetitive text dictionary-encoded.
+    """
+    return {name: _compact_column(name, [row[name] for row in rows]) for name in TABLE_COLUMNS[table]}
+
+
+def _whole_seconds(values):
+    """Whether a datetime64 column has second or day resolution (rendered without fractions)"""
+    return np.datetime_data(values.dtype)[0] in ('s', 'D')
+
+
+def _column_values(values):
+    """Convert a column array to Python values, mapping null sentinels to None"""
+    if isinstance(values, DictionaryColumn):
+        return values.values[values.codes].tolist()
+    if values.dtype.kind == 'S':
+        return [v.decode('ascii') if v else None for v in values.tolist()]
+    if values.dtype.kind == 'f':
+        return [None if v != v else v for v in values.tolist()]
+    if values.dtype.kind == 'M':
+        return values.astype(object).tolist()
+    return values.tolist()
+
+
+# ASCII tens and units digit of 0..99, for rendering two digits per division
+_TENS_DIGITS = np.repeat(np.arange(ord('0'), ord('9') + 1, dtype=np.uint8), 10)
+_UNITS_DIGITS = np.tile(np.arange(ord('0'), ord('9') + 1, dtype=np.uint8), 10)
+
+
+def _put_digits(buf, column, numbers, width):
+    """Write zero-padded decimal numbers into character rows buf[column:column + width]"""
+    for position in range(width - 2, -1, -2):
+        pair = numbers % 100
+        buf[column + position] = _TENS_DIGITS.take(pair)
+        buf[column + position + 1] = _UNITS_DIGITS.take(pair)
+        numbers = numbers // 100
+
+
+def format_datetimes(values):
+    """Render datetime64 values as b'YYYY-MM-DD HH:MM:SS' (b'YYYY-MM-DD' for day units).
+    
+    Uses integer arithmetic (days-to-civil conversion) instead of numpy's
+    per-element datetime to string cast, which is several times slower.
+    """
+    days = values.astype('datetime64[D]').astype(np.int64)
+    era = (days + 719468) // 146097
+    day_of_era = days + 719468 - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = np.where(month_index < 10, month_index + 3, month_index - 9)
+    year = year_of_era + era * 400 + (month <= 2)
+    
+    # Fill one character position at a time (contiguous rows), then transpose once
+    with_time = values.dtype != np.dtype('datetime64[D]')
+    width = 19 if with_time else 10
+    buf = np.full((width, len(values)), ord(' '), dtype=np.uint8)
+    _put_digits(buf, 0, year, 4)
+    _put_digits(buf, 5, month, 2)
+    _put_digits(buf, 8, day, 2)
+    buf[[4, 7]] = ord('-')
+    if with_time:
+        seconds = values.astype('datetime64[s]').astype(np.int64) - days * 86400
+        _put_digits(buf, 11, seconds // 3600, 2)
+        _put_digits(buf, 14, seconds // 60 % 60, 2)
+        _put_digits(buf, 17, seconds % 60, 2)
+        buf[[13, 16]] = ord(':')
+    return np.ascontiguousarray(buf.T).view(f'S{width}').ravel()
+
+
+def _text_values(values):
+    """Convert a column array to Python values, rendering datetimes as text like str(datetime)"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'M':
+        if _whole_seconds(values):
+            return format_datetimes(values).astype('U').tolist()
+        return [None if value is None else str(value) for value in values.astype(object).tolist()]
+    return _column_values(values)
+
+
+# A chunk is either a list of row dicts (row-by-row tables) or a column mapping (vectorized tables)
+
+def chunk_rows(table, chunk):
+    """Rows of a chunk as tuples in TABLE_COLUMNS order, with dates and datetimes as text"""
+    names = TABLE_COLUMNS[table]
+    if isinstance(chunk, dict):
+        return list(zip(*(_text_values(chunk[name]) for name in names)))
+    return [tuple(str(row[name]) if isinstance(row[name], (datetime, date)) else row[name] for name in names)
+            for row in chunk]
+
+
+def sql_literal(value):
+    """Render a Python value as a SQL literal, doubling embedded single quotes"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return "NULL" if value != value else str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def copy_text(value):
+    """Render a value for PostgreSQL COPY text format (\\N for NULL, backslash escapes)"""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def csv_field(value):
+    """Render a value as a CSV field, quoting it only if it contains a delimiter, quote or newline"""
+    text = str(value)
+    if any(c in text for c in ',"\n\r'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _render_column(values, null, quote, escape):
+    """Render a column array as text: generated ASCII ids/timestamps are only quoted,
+    free text (object columns) goes through escape(), missing values become null"""
+    if isinstance(values, DictionaryColumn):
+        # Render each distinct value once, then expand by code
+        rendered = np.empty(len(values.values), dtype=object)
+        rendered[:] = _render_column(values.values, null, quote, escape)
+        return rendered[values.codes].tolist()
+    if values.dtype.kind == 'M':
+        # Sub-second timestamps keep str(datetime) formatting via the object path below
+        values = format_datetimes(values) if _whole_seconds(values) else values.astype(object)
+    if values.dtype.kind == 'S':
+        return [f"{quote}{v}{quote}" if v else null for v in values.astype('U').tolist()]
+    if values.dtype.kind == 'f':
+        return [null if v != v else str(v) for v in values.tolist()]
+    if values.dtype.kind in 'iu':
+        return list(map(str, values.tolist()))
+    # Text columns are mostly drawn from small pools, so escape each distinct value once
+    rendered = {None: null}
+    return [rendered[v] if v in rendered else rendered.setdefault(v, escape(v)) for v in values.tolist()]
+
+
+def _render_chunk(table, chunk, render_column, render_value):
+    """Rows of a chunk as tuples of rendered text in TABLE_COLUMNS order"""
+    names = TABLE_COLUMNS[table]
+    if isinstance(chunk, dict):
+        return list(zip(*(render_column(chunk[name]) for name in names)))
+    return [tuple(render_value(str(row[name]) if isinstance(row[name], (datetime, date)) else row[name])
+                  for name in names) for row in chunk]
+
+
+def chunk_literals(table, chunk):
+    """Rows of a chunk as tuples of SQL literals in TABLE_COLUMNS order"""
+    return _render_chunk(table, chunk, lambda values: _render_column(values, "NULL", "'", sql_literal), sql_literal)
+
+
+def chunk_csv_fields(table, chunk):
+    """Rows of a chunk as tuples of CSV fields in TABLE_COLUMNS order (NULL is an empty field)"""
+    return _render_chunk(table, chunk, lambda values: _render_column(values, "", "", csv_field),
+                         lambda value: "" if value is None else csv_field(value))
+
+
+def chunk_copy_fields(table, chunk):
+    """Rows of a chunk as tuples of COPY text-format fields in TABLE_COLUMNS order"""
+    return _render_chunk(table, chunk, lambda values: _render_column(values, "\\N", "", copy_text), copy_text)
+
+
+def chunk_values(table, chunk):
+    """Rows of a chunk as tuples of Python values in TABLE_COLUMNS order"""
+    names = TABLE_COLUMNS[table]
+    if isinstance(chunk, dict):
+        return zip(*(_column_values(chunk[name]) for name in names))
+    return (tuple(row[name] for name in names) for row in chunk)
+
+
+def chunk_length(chunk):
+    """Number of rows in a chunk"""
+    return len(next(iter(chunk.values()))) if isinstance(chunk, dict) else len(chunk)
+
+
+class RelationalIndex:
+    """In-memory relational index over generated tables.
+    
+    Holds the id array of each table, an id -> row lookup, and parent -> child
+    buckets stored CSR-style: the child rows of parent row p are
+    members[offsets[p]:offsets[p + 1]], in child table order, so listing the
+    employees of a branch or the accounts of a customer is a constant-time slice.
+    """
+    
     def __init__(self):
+        self.ids = {}
+        self._lookup = {}
+        self.buckets = {}
+    
+    def add_table(self, table, ids):
+        """Register a table's id array (row order is the generation order)"""
+        ids = np.asarray(ids, dtype='S')
+        order = np.argsort(ids, kind='stable')
+        self.ids[table] = ids
+        self._lookup[table] = (ids[order], order)
+    
+    def rows(self, table, ids):
+        """Row positions of the given ids in a table, -1 where an id is unknown"""
+        sorted_ids, order = self._lookup[table]
+        ids = np.asarray(ids, dtype='S')
+        known = np.ones(len(ids), dtype=bool)
+        if ids.dtype.itemsize > sorted_ids.dtype.itemsize:
+            # Ids longer than any in the table are unknown (the cast below would truncate them)
+            known = np.char.str_len(ids) <= sorted_ids.dtype.itemsize
+        ids = ids.astype(sorted_ids.dtype)
+        if not len(sorted_ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        found = np.searchsorted(sorted_ids, ids).clip(max=len(sorted_ids) - 1)
+        return np.where(known & (sorted_ids[found] == ids), order[found], -1)
+    
+    def add_bucket(self, parent, child, parent_ids):
+        """Group child rows by parent, given the child table's foreign key column"""
+        parent_rows = self.rows(parent, parent_ids)
+        linked = np.flatnonzero(parent_rows >= 0)
+        members = linked[np.argsort(parent_rows[linked], kind='stable')]
+        counts = np.bincount(parent_rows[linked], minlength=len(self.ids[parent]))
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        self.buckets[parent, child] = (offsets, members)
+    
+    def children(self, parent, child, parent_row):
+        """Child table rows that reference the given parent row"""
+        offsets, members = self.buckets[parent, child]
+        return members[offsets[parent_row]:offsets[parent_row + 1]]
+
+
+def zipf_cdf(count, skew, seed):
+    """Cumulative weights for sampling count parents with a Zipf(skew) popularity.
+    
+    Popularity ranks are a seeded permutation, so the busiest parents are
+    spread over the table and every process derives the same weights.
+    """
+    ranks = np.random.default_rng([seed, count]).permutation(count) + 1
+    weights = ranks.astype(np.float64) ** -skew
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def sample_parents(rng, count, size, cdf=None):
+    """Draw size parent rows out of count, uniformly or following a cumulative weight array"""
+    if cdf is None:
+        return rng.integers(0, count, size)
+    return np.searchsorted(cdf, rng.random(size), side='right').clip(max=count - 1)
+
+
+def delta_counts(rows):
+    """Split an incremental batch of rows over DELTA_TABLES in DEFAULT_COUNTS proportions"""
+    total = sum(DEFAULT_COUNTS[table] for table in DELTA_TABLES)
+    counts = {table: rows * DEFAULT_COUNTS[table] // total for table in DELTA_TABLES[:-1]}
+    counts['transactions'] = rows - sum(counts.values())
+    return counts
+
+
+class ValuePools:
+    """Pools of Faker values built once per seed and locale, then sampled per row.
+    
+    Picking from a pool costs one random index instead of a Faker call. The
+    pools can be cached on disk (one .npz file per seed, locale and size),
+    so later runs and worker processes skip Faker entirely.
+    """
+    
+    # Pool name -> Faker provider call. Descriptions come first so they match
+    # the description pool the vectorized generator has always used.
+    PROVIDERS = {
+        'description': lambda fake: fake.text(max_nb_chars=100),
+        'first_name': lambda fake: fake.first_name(),
+        'last_name': lambda fake: fake.last_name(),
+        'name': lambda fake: fake.name(),
+        'user_name': lambda fake: fake.user_name(),
+        'email_domain': lambda fake: fake.free_email_domain(),
+        'phone': lambda fake: fake.phone_number(),
+        'address': lambda fake: fake.address(),
+        'street_address': lambda fake: fake.street_address(),
+        'zip_code': lambda fake: fake.zipcode(),
+    }
+    
+    def __init__(self, pools):
+        # name -> list of str (row-by-row sampling) and object array (vectorized sampling)
+        self.lists = {name: list(values) for name, values in pools.items()}
+        self.arrays = {name: np.array(values, dtype=object) for name, values in self.lists.items()}
+    
+    @classmethod
+    def build(cls, seed=42, locale='en_US', size=VALUE_POOL_SIZE, telemetry=None):
+        """Draw every pool from a Faker instance seeded with seed (counting the Faker calls in telemetry)"""
+        fake = Faker(locale)
+        fake.seed_instance(seed)
+        pools = {}
+        for name, provider in cls.PROVIDERS.items():
+            count = DESCRIPTION_POOL_SIZE if name == 'description' else size
+            pools[name] = [provider(fake) for _ in range(count)]
+            if telemetry is not None:
+                telemetry.count('faker_calls', count)
+        return cls(pools)
+    
+    @classmethod
+    def load(cls, seed=42, locale='en_US', size=VALUE_POOL_SIZE, cache_dir=None, telemetry=None):
+        """Read the pools from cache_dir if cached there, else build them (and cache them)"""
+        if cache_dir is None:
+            return cls.build(seed, locale, size, telemetry)
+        path = os.path.join(cache_dir, f"value_pools_{locale}_{seed}_{size}.npz")
+        if os.path.exists(path):
+            if telemetry is not None:
+                telemetry.count('value_pool_cache_hits')
+            with np.load(path) as data:
+                return cls({name: data[name].tolist() for name in cls.PROVIDERS})
+        pools = cls.build(seed, locale, size, telemetry)
+        pools.save(path)
+        return pools
+    
+    def save(self, path):
+        """Write the pools to an .npz file (renamed into place, so readers never see half a file)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, 'wb') as out:
+            np.savez_compressed(out, **{name: np.array(values, dtype=str) for name, values in self.lists.items()})
+        os.replace(partial, path)
+    
+    def choice(self, rnd, name):
+        """One value of a pool picked with a random.Random"""
+        values = self.lists[name]
+        return values[rnd.randrange(len(values))]
+    
+    def sample(self, rng, name, count):
+        """count values of a pool picked with a NumPy Generator, as a DictionaryColumn"""
+        values = self.arrays[name]
+        return DictionaryColumn(rng.integers(0, len(values), count).astype(_code_dtype(len(values))), values)
+
+
+def peak_rss_bytes(who='self'):
+    """Peak resident set size of this process ('self') or of its finished child processes ('children').
+    
+    For this process it is read from VmHWM where /proc has it, so it counts from
+    the last reset through /proc/self/clear_refs; else from getrusage (None on
+    platforms without the resource module, like Windows).
+    """
+    if who == 'self':
+        try:
+            with open('/proc/self/status') as status:
+                for line in status:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == 'self' else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+class _StackSampler(threading.Thread):
+    """Sampling profiler: records the main thread's call stack every interval seconds.
+    
+    Stacks are written in the collapsed "frame;frame;frame count" format that
+    flame graph tools read. Costs one stack walk per sample, whatever the code does.
+    """
+    
+    def __init__(self, interval=0.005):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.interval = interval
+        self.thread_id = threading.main_thread().ident
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+    
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+    
+    def stop(self, path):
+        self._stopped.set()
+        self.join()
+        with open(path, 'w', encoding='utf-8') as out:
+            out.write(''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+
+
+class Telemetry:
+    """Structured run metrics written as JSON lines: stage timings, progress, counters and memory.
+    
+    Every event is one JSON object with the event type, a timestamp and the
+    process id. stage() times a block (a stage, optionally of one table) and
+    records rows/sec and the peak RSS at its end; progress() emits rows/sec
+    and an ETA at most every progress_seconds per table; count() accumulates
+    counters such as Faker calls, reported by close(). profile='cprofile' or
+    'sample' captures a profile of the run into profile_output (with or
+    without an output for the events).
+    
+    Without an output every hook returns immediately, so instrumented code
+    costs next to nothing when telemetry is off (the default).
+    """
+    
+    def __init__(self, output=None, progress_seconds=DEFAULT_PROGRESS_SECONDS, profile=None, profile_output=None):
+        self.enabled = output is not None
+        self.progress_seconds = progress_seconds
+        self.counters = Counter()
+        self._progress = {}
+        self._file = None
+        self._profiler = None
+        self.started = time.perf_counter()
+        if profile not in (None, *PROFILERS):
+            raise ValueError(f"Unknown profiler {profile!r}")
+        if self.enabled:
+            self._file = sys.stderr if output == '-' else open(output, 'a', encoding='utf-8')
+        self.profile_output = profile_output or f"banking_profile.{'prof' if profile == 'cprofile' else 'folded'}"
+        if profile == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif profile == 'sample':
+            self._profiler = _StackSampler()
+            self._profiler.start()
+    
+    def emit(self, event, **fields):
+        """Write one event line"""
+        if not self.enabled:
+            return
+        record = {'event': event, 'ts': round(time.time(), 6), 'pid': os.getpid(), **fields}
+        self._file.write(json.dumps(record, default=str) + '\n')
+        self._file.flush()
+    
+    def record(self, stage, seconds, table=None, rows=None, **fields):
+        """Emit the timing of a stage measured by the caller"""
+        if not self.enabled:
+            return
+        if rows is not None:
+            fields.update(rows=rows, rows_per_sec=round(rows / seconds, 1) if seconds else None)
+        self.emit('stage', stage=stage, table=table, seconds=round(seconds, 6), peak_rss_bytes=peak_rss_bytes(),
+                  **fields)
+    
+    @contextlib.contextmanager
+    def _timed(self, stage, table, rows, fields):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, table, rows, **fields)
+    
+    def stage(self, stage, table=None, rows=None, **fields):
+        """Context manager timing a stage (of one table, producing rows rows if known)"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(stage, table, rows, fields)
+    
+    def progress(self, table, done, total=None):
+        """Report done of total rows of a table, rate-limited to one event per progress_seconds"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        started, last = self._progress.setdefault(table, [now, now])
+        if now - last < self.progress_seconds and done != total:
+            return
+        self._progress[table][1] = now
+        rate = done / (now - started) if now > started else None
+        eta = (total - done) / rate if rate and total is not None else None
+        self.emit('progress', table=table, rows=done, total=total,
+                  rows_per_sec=round(rate, 1) if rate else None, eta_seconds=round(eta, 1) if eta is not None else None)
+    
+    def count(self, name, amount=1):
+        """Add to a counter reported by close()"""
+        if self.enabled:
+            self.counters[name] += amount
+    
+    def close(self):
+        """Stop the profiler and emit the run summary: counters and memory high-water marks"""
+        if self._profiler is not None:
+            if isinstance(self._profiler, _StackSampler):
+                self._profiler.stop(self.profile_output)
+            else:
+                self._profiler.disable()
+                self._profiler.dump_stats(self.profile_output)
+            self.emit('profile', profiler='sample' if isinstance(self._profiler, _StackSampler) else 'cprofile',
+                      path=self.profile_output)
+            self._profiler = None
+        if not self.enabled:
+            return
+        self.emit('summary', seconds=round(time.perf_counter() - self.started, 6), counters=dict(self.counters),
+                  peak_rss_bytes=peak_rss_bytes(), peak_rss_children_bytes=peak_rss_bytes('children'))
+        if self._file is not sys.stderr:
+            self._file.close()
+        self.enabled = False
+
+
+def add_telemetry_arguments(parser):
+    """Add the --telemetry, --progress-seconds and --profile options to a command line parser"""
+    parser.add_argument('--telemetry', metavar='PATH',
+                        help="append stage timings, progress and counters as JSON lines to PATH ('-' for stderr)")
+    parser.add_argument('--progress-seconds', type=float, default=DEFAULT_PROGRESS_SECONDS,
+                        help="seconds between progress events per table")
+    parser.add_argument('--profile', choices=PROFILERS,
+                        help="profile the run with cProfile or a stack sampler")
+    parser.add_argument('--profile-output', help="profile file (default banking_profile.prof or .folded)")
+
+
+def telemetry_from_args(args):
+    """Telemetry configured by the add_telemetry_arguments options (disabled without --telemetry)"""
+    return Telemetry(args.telemetry, args.progress_seconds, args.profile, args.profile_output)
+
+
+class BankingDataGenerator:
+    def __init__(self, seed=42, reference_time=None, transaction_skew=0.0, locale='en_US', pool_cache_dir=None,
+                 ledger=False, telemetry=None):
         self.branches = []
         self.customers = []
         self.employees = []
         self.accounts = []
         self.transactions = []
+
+        # Columnar tables produced by the vectorized generators (table -> {column: array})
+        self.columns = {}
+        # Parent key arrays retained by the streaming generators (table -> {column: array})
+        self.keys = {}
+        # Per-instance seeded sources, so generation never depends on global state
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+        # Fixed "now" so output does not drift between runs or between worker processes
+        if reference_time is None:
+            reference_time = datetime.now().replace(microsecond=0)
+        self.now = reference_time
+        self.reference_time = np.datetime64(reference_time, 's')
+        # Zipf exponent of transactions per account (0 samples accounts uniformly)
+        self.transaction_skew = transaction_skew
+        # Generate transactions as per-account ledgers that close on accounts.balance
+        self.ledger = ledger
+        self._parent_cdfs = {}
+        # Rows generated so far per table, and incremental batches emitted on top of them
+        self.row_counts = {}
+        self.delta_batch = 0
+        # Id lookups and parent -> child buckets over the generated tables (see build_index)
+        self.index = RelationalIndex()
+        # Where the incremental output stood at the last saved state (see save_state)
+        self.saved_output = None
+        # Faker value pools, built (or read from pool_cache_dir) on first use
+        self.locale = locale
+        self.pool_cache_dir = pool_cache_dir
+        self._value_pools = None
+        # Stage timings, progress and counters (off unless a Telemetry with an output is passed)
+        self.telemetry = Telemetry() if telemetry is None else telemetry
         
+    def _ago(self, days, now=None):
+        """Datetime the given number of days before now (by default the reference time)"""
+        return (self.now if now is None else now) - timedelta(days=days)
+    
     def generate_id(self, prefix="", length=8):
         """Generate a unique ID with optional prefix"""
-        return prefix + ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+        return prefix + ''.join(self.random.choices(string.ascii_uppercase + string.digits, k=length))
     
     def generate_branches(self, count=50):
         """Generate branch data"""
@@ -44,17 +813,18 @@ class BankingDataGenerator:
         
         states = ["NY", "CA", "IL", "TX", "AZ", "PA", "FL", "OH", "IN"]
         
+        pools = self.get_value_pools()
         for i in range(count):
             branch = {
                 'id': self.generate_id('BR', 10),
-                'name': f"{random.choice(branch_names)} {i+1}" if i >= len(branch_names) else f"{branch_names[i % len(branch_names)]} {(i//len(branch_names))+1}",
-                'address': fake.street_address(),
-                'city': random.choice(cities),
-                'state': random.choice(states),
-                'zip_code': fake.zipcode(),
+                'name': f"{self.random.choice(branch_names)} {i+1}" if i >= len(branch_names) else f"{branch_names[i % len(branch_names)]} {(i//len(branch_names))+1}",
+                'address': pools.choice(self.random, 'street_address'),
+                'city': self.random.choice(cities),
+                'state': self.random.choice(states),
+                'zip_code': pools.choice(self.random, 'zip_code'),
                 'manager_id': None,  # Will be set after employees are created
-                'created_at': fake.date_time_between(start_date='-5y', end_date='now'),
-                'updated_at': fake.date_time_between(start_date='-1y', end_date='now')
+                'created_at': _random_datetime(self.random, self._ago(5 * 365), self.now),
+                'updated_at': _random_datetime(self.random, self._ago(365), self.now)
             }
             self.branches.append(branch)
     
@@ -69,109 +839,127 @@ class BankingDataGenerator:
             "Branch Manager", "Senior Teller", "Credit Analyst"
         ]
         
+        pools = self.get_value_pools()
         for i in range(count):
-            branch_id = random.choice(self.branches)['id']
-            hire_date = fake.date_between(start_date='-10y', end_date='now')
+            branch_id = self.random.choice(self.branches)['id']
+            hire_date = _random_date(self.random, self._ago(10 * 365), self.now)
             
             employee = {
                 'id': self.generate_id('EMP', 10),
                 'branch_id': branch_id,
-                'name': fake.name(),
-                'email': fake.unique.email(),
-                'phone': fake.phone_number(),
-                'position': random.choice(positions),
+                'name': pools.choice(self.random, 'name'),
+                'email': f"{pools.choice(self.random, 'user_name')}+{i + 1}@{pools.choice(self.random, 'email_domain')}",
+                'phone': pools.choice(self.random, 'phone'),
+                'position': self.random.choice(positions),
                 'hire_date': hire_date,
-                'salary': round(random.uniform(30000, 150000), 2),
-                'created_at': fake.date_time_between(start_date=hire_date, end_date='now'),
-                'updated_at': fake.date_time_between(start_date=hire_date, end_date='now')
+                'salary': round(self.random.uniform(30000, 150000), 2),
+                'created_at': _random_datetime(self.random, hire_date, self.now),
+                'updated_at': _random_datetime(self.random, hire_date, self.now)
             }
             self.employees.append(employee)
         
-        # Assign managers to branches
-        managers = [emp for emp in self.employees if emp['position'] in ['Manager', 'Branch Manager']]
-        for branch in self.branches:
-            available_managers = [m for m in managers if m['branch_id'] == branch['id']]
+        # Assign managers to branches, walking each branch's employee bucket
+        self.index = RelationalIndex()
+        self.index.add_table('branches', [branch['id'] for branch in self.branches])
+        self.index.add_table('employees', [emp['id'] for emp in self.employees])
+        self.index.add_bucket('branches', 'employees', [emp['branch_id'] for emp in self.employees])
+        for row, branch in enumerate(self.branches):
+            available_managers = [self.employees[e] for e in self.index.children('branches', 'employees', row)
+                                  if self.employees[e]['position'] in ['Manager', 'Branch Manager']]
             if available_managers:
-                branch['manager_id'] = random.choice(available_managers)['id']
+                branch['manager_id'] = self.random.choice(available_managers)['id']
     
     def generate_customers(self, count=2000):
         """Generate customer data with edge cases"""
         print(f"Generating {count} customers...")
         
-        genders = ['male', 'female', 'other', 'prefer_not_to_say']
-        
+        branch_ids = [branch['id'] for branch in self.branches]
         for i in range(count):
-            # Create some edge cases
-            birth_date = fake.date_between(start_date='-90y', end_date='-18y')
-            
-            # Some customers with very old or very recent registration
-            if i < 50:  # Very old customers
-                created_date = fake.date_time_between(start_date='-20y', end_date='-15y')
-            elif i < 100:  # Very recent customers
-                created_date = fake.date_time_between(start_date='-30d', end_date='now')
-            else:
-                created_date = fake.date_time_between(start_date='-10y', end_date='now')
-            
-            customer = {
-                'id': self.generate_id('CUST', 10),
-                'email': fake.unique.email(),
-                'phone': fake.phone_number() if random.random() > 0.05 else None,  # 5% without phone
-                'address': fake.address() if random.random() > 0.02 else None,  # 2% without address
-                'first_name': fake.first_name(),
-                'last_name': fake.last_name(),
-                'date_of_birth': birth_date,
-                'gender': random.choice(genders),
-                'national_id': fake.unique.ssn(),
-                'created_at': created_date,
-                'updated_at': fake.date_time_between(start_date=created_date, end_date='now'),
-                'branch_id': random.choice(self.branches)['id']
-            }
-            self.customers.append(customer)
+            self.customers.append(self._make_customer(i, self.random, branch_ids))
+    
+    def _make_customer(self, i, rnd, branch_ids, since=None, now=None):
+        """Build the i-th customer row (low indexes are registration edge cases).
+        
+        The id, email and national_id are derived from the global row index
+        rather than drawn with fake.unique, so they stay unique when customers
+        are generated in independent shards or incremental batches (the email
+        counter follows a '+', which pooled user names never contain, so a name
+        ending in digits cannot run into it). Everything else is picked from
+        the value pools with rnd. Customers of incremental batches register
+        between since and now (by default the reference time).
+        """
+        if now is None:
+            now = self.now
+        pools = self.get_value_pools()
+        # Create some edge cases
+        birth_date = _random_date(rnd, self._ago(90 * 365, now), self._ago(18 * 365, now))
+        
+        # Some customers with very old or very recent registration
+        if since is not None:  # Registered during an incremental batch
+            created_date = _random_datetime(rnd, since, now)
+        elif i < 50:  # Very old customers
+            created_date = _random_datetime(rnd, self._ago(20 * 365, now), self._ago(15 * 365, now))
+        elif i < 100:  # Very recent customers
+            created_date = _random_datetime(rnd, self._ago(30, now), now)
+        else:
+            created_date = _random_datetime(rnd, self._ago(10 * 365, now), now)
+        
+        return {
+            'id': f"CUST{i + 1:010d}",
+            'email': f"{pools.choice(rnd, 'user_name')}+{i + 1}@{pools.choice(rnd, 'email_domain')}",
+            'phone': pools.choice(rnd, 'phone') if rnd.random() > 0.05 else None,  # 5% without phone
+            'address': pools.choice(rnd, 'address') if rnd.random() > 0.02 else None,  # 2% without address
+            'first_name': pools.choice(rnd, 'first_name'),
+            'last_name': pools.choice(rnd, 'last_name'),
+            'date_of_birth': birth_date,
+            'gender': rnd.choice(GENDERS),
+            'national_id': _national_id(i),
+            'created_at': created_date,
+            'updated_at': _random_datetime(rnd, created_date, now),
+            'branch_id': rnd.choice(branch_ids)
+        }
     
     def generate_accounts(self, count=3000):
         """Generate account data with various types and statuses"""
         print(f"Generating {count} accounts...")
         
-        account_types = ['checking', 'savings', 'credit', 'loan']
-        statuses = ['active', 'inactive', 'closed', 'suspended']
-        
         for i in range(count):
-            customer = random.choice(self.customers)
-            account_type = random.choice(account_types)
-            status = random.choice(statuses) if i < 200 else 'active'  # Most accounts active
+            customer = self.random.choice(self.customers)
+            account_type = self.random.choice(ACCOUNT_TYPES)
+            status = self.random.choice(ACCOUNT_STATUSES) if i < 200 else 'active'  # Most accounts active
             
             # Different balance ranges based on account type
             if account_type == 'checking':
-                balance = round(random.uniform(-1000, 50000), 2)
+                balance = round(self.random.uniform(-1000, 50000), 2)
             elif account_type == 'savings':
-                balance = round(random.uniform(0, 100000), 2)
+                balance = round(self.random.uniform(0, 100000), 2)
             elif account_type == 'credit':
-                balance = round(random.uniform(-10000, 0), 2)  # Negative for credit
+                balance = round(self.random.uniform(-10000, 0), 2)  # Negative for credit
             else:  # loan
-                balance = round(random.uniform(-50000, 0), 2)  # Negative for loan
+                balance = round(self.random.uniform(-50000, 0), 2)  # Negative for loan
             
             # Some edge cases for testing
             if i < 10:  # Very high balance accounts
-                balance = round(random.uniform(1000000, 5000000), 2)
+                balance = round(self.random.uniform(1000000, 5000000), 2)
             elif i < 20:  # Zero balance accounts
                 balance = 0.00
             elif i < 30:  # Very low balance accounts
-                balance = round(random.uniform(0.01, 10.00), 2)
+                balance = round(self.random.uniform(0.01, 10.00), 2)
             
-            opened_date = fake.date_between(start_date=customer['created_at'].date(), end_date='now')
+            opened_date = _random_date(self.random, customer['created_at'], self.now)
             
             account = {
                 'id': self.generate_id('ACC', 10),
                 'customer_id': customer['id'],
-                'account_number': fake.unique.bban(),
+                'account_number': f"{i + 1:018d}",  # Same counter format as the vectorized accounts
                 'type': account_type,
                 'balance': balance,
                 'opened_at': opened_date,
-                'interest_rate': round(random.uniform(0.01, 5.00), 4) if account_type in ['savings', 'loan'] else None,
+                'interest_rate': round(self.random.uniform(0.01, 5.00), 4) if account_type in ['savings', 'loan'] else None,
                 'status': status,
                 'branch_id': customer['branch_id'],
-                'created_at': fake.date_time_between(start_date=opened_date, end_date='now'),
-                'updated_at': fake.date_time_between(start_date=opened_date, end_date='now')
+                'created_at': _random_datetime(self.random, opened_date, self.now),
+                'updated_at': _random_datetime(self.random, opened_date, self.now)
             }
             self.accounts.append(account)
     
@@ -179,35 +967,40 @@ class BankingDataGenerator:
         """Generate transaction data with various patterns"""
         print(f"Generating {count} transactions...")
         
-        transaction_types = ['deposit', 'withdrawal', 'transfer', 'fee', 'interest']
-        statuses = ['pending', 'completed', 'failed', 'cancelled']
-        
+        pools = self.get_value_pools()
+        # Zipf weights of the accounts when transaction_skew is set (None keeps the uniform choice)
+        cdf = self._parent_cdf(len(self.accounts), self.transaction_skew)
+        if cdf is not None:
+            cdf = cdf.tolist()
         for i in range(count):
-            account = random.choice(self.accounts)
-            trans_type = random.choice(transaction_types)
-            status = random.choice(statuses) if i < 500 else 'completed'  # Most completed
+            if cdf is None:
+                account = self.random.choice(self.accounts)
+            else:
+                account = self.accounts[min(bisect.bisect_right(cdf, self.random.random()), len(self.accounts) - 1)]
+            trans_type = self.random.choice(TRANSACTION_TYPES)
+            status = self.random.choice(TRANSACTION_STATUSES) if i < 500 else 'completed'  # Most completed
             
             # Amount based on transaction type
             if trans_type == 'deposit':
-                amount = round(random.uniform(10, 10000), 2)
+                amount = round(self.random.uniform(10, 10000), 2)
             elif trans_type == 'withdrawal':
-                amount = round(random.uniform(-5000, -1), 2)
+                amount = round(self.random.uniform(-5000, -1), 2)
             elif trans_type == 'transfer':
-                amount = round(random.uniform(-2000, 2000), 2)
+                amount = round(self.random.uniform(-2000, 2000), 2)
             elif trans_type == 'fee':
-                amount = round(random.uniform(-100, -1), 2)
+                amount = round(self.random.uniform(-100, -1), 2)
             else:  # interest
-                amount = round(random.uniform(0.01, 500), 2)
+                amount = round(self.random.uniform(0.01, 500), 2)
             
             # Some edge cases
             if i < 20:  # Very large transactions
-                amount = round(random.uniform(100000, 1000000), 2) if trans_type == 'deposit' else round(random.uniform(-1000000, -100000), 2)
+                amount = round(self.random.uniform(100000, 1000000), 2) if trans_type == 'deposit' else round(self.random.uniform(-1000000, -100000), 2)
             elif i < 40:  # Very small transactions
-                amount = round(random.uniform(0.01, 1.00), 2) if trans_type == 'deposit' else round(random.uniform(-1.00, -0.01), 2)
+                amount = round(self.random.uniform(0.01, 1.00), 2) if trans_type == 'deposit' else round(self.random.uniform(-1.00, -0.01), 2)
             
             # Transaction date should be after account opening
-            start_date = max(account['opened_at'], (datetime.now() - timedelta(days=365)).date())
-            trans_date = fake.date_time_between(start_date=start_date, end_date='now')
+            start_date = max(account['opened_at'], self._ago(365).date())
+            trans_date = _random_datetime(self.random, start_date, self.now)
             
             transaction = {
                 'id': self.generate_id('TXN', 10),
@@ -215,179 +1008,1000 @@ class BankingDataGenerator:
                 'transaction_date': trans_date,
                 'amount': amount,
                 'type': trans_type,
-                'description': fake.text(max_nb_chars=100),
+                'description': pools.choice(self.random, 'description'),
                 'status': status,
                 'created_at': trans_date,
-                'updated_at': fake.date_time_between(start_date=trans_date, end_date='now'),
-                'employee_id': random.choice(self.employees)['id'] if random.random() > 0.3 else None
+                'updated_at': _random_datetime(self.random, trans_date, self.now),
+                'employee_id': self.random.choice(self.employees)['id'] if self.random.random() > 0.3 else None
             }
             self.transactions.append(transaction)
     
-    def generate_all_data(self):
-        """Generate all test data"""
+    def get_value_pools(self):
+        """Build (once, or read from the pool cache) the Faker value pools rows are picked from"""
+        if self._value_pools is None:
+            with self.telemetry.stage('value_pools'):
+                self._value_pools = ValuePools.load(self.seed, self.locale, cache_dir=self.pool_cache_dir,
+                                                    telemetry=self.telemetry)
+        return self._value_pools
+    
+    def _key_column(self, table, column, dtype='S'):
+        """One column of a table as an array: from retained keys, compact columns or row dicts"""
+        for source in (self.keys, self.columns):
+            if column in source.get(table, {}):
+                return source[table][column]
+        return np.array([row[column] for row in getattr(self, table)], dtype=dtype)
+    
+    def _customer_keys(self):
+        """Customer id, branch_id and created_at arrays used as account parents"""
+        return (
+            self._key_column('customers', 'id'),
+            self._key_column('customers', 'branch_id'),
+            self._key_column('customers', 'created_at', 'datetime64[s]'),
+        )
+    
+    def _account_keys(self):
+        """Account id and opened_at arrays used as transaction parents"""
+        return self._key_column('accounts', 'id'), self._key_column('accounts', 'opened_at', 'datetime64[D]')
+    
+    def _employee_keys(self):
+        """Employee id array used as transaction parents"""
+        return self._key_column('employees', 'id')
+    
+    def _parent_cdf(self, count, skew):
+        """Cached Zipf sampling weights for count parents, or None for uniform sampling"""
+        if not skew:
+            return None
+        if (count, skew) not in self._parent_cdfs:
+            self._parent_cdfs[count, skew] = zipf_cdf(count, skew, self.seed)
+        return self._parent_cdfs[count, skew]
+    
+    def build_index(self):
+        """Index the generated tables: id arrays and id -> row lookups for every table,
+        plus branch -> employees, branch -> customers and customer -> accounts buckets"""
+        index = RelationalIndex()
+        index.add_table('branches', self._branch_ids())
+        index.add_table('employees', self._employee_keys())
+        index.add_table('customers', self._customer_keys()[0])
+        index.add_table('accounts', self._account_keys()[0])
+        index.add_bucket('branches', 'employees', self._employee_branches())
+        index.add_bucket('branches', 'customers', self._customer_keys()[1])
+        index.add_bucket('customers', 'accounts', self._account_customers())
+        self.index = index
+        return index
+    
+    def _employee_branches(self):
+        """Employee branch_id array"""
+        return self._key_column('employees', 'branch_id')
+    
+    def _account_customers(self):
+        """Account customer_id array"""
+        return self._key_column('accounts', 'customer_id')
+    
+    def _account_block(self, rng, start, count, customers, since=None, now=None):
+        """Account columns for global rows [start, start + count), opened after since if given
+        and by now (a datetime64, by default the reference time)"""
+        if now is None:
+            now = self.reference_time
+        row = start + np.arange(count)
+        customer_ids, customer_branches, customer_created = customers
+        
+        customer = rng.integers(0, len(customer_ids), count)
+        account_type = rng.integers(0, len(ACCOUNT_TYPES), count)
+        active = ACCOUNT_STATUSES.index('active')
+        status = np.where(row < 200, rng.integers(0, len(ACCOUNT_STATUSES), count), active)  # Most accounts active
+        
+        # Balance range depends on account type, then the same edge cases as generate_accounts
+        low, high = BALANCE_RANGES[account_type].T
+        balance = rng.uniform(low, high)
+        balance = np.where(row < 10, rng.uniform(1000000, 5000000, count), balance)  # Very high balance
+        balance = np.where((row >= 10) & (row < 20), 0.0, balance)  # Zero balance
+        balance = np.where((row >= 20) & (row < 30), rng.uniform(0.01, 10.00, count), balance)  # Very low balance
+        balance = np.round(balance, 2)
+        
+        # Opened on a day between the customer's registration and today
+        first_day = customer_created[customer].astype('datetime64[D]')
+        if since is not None:
+            first_day = np.maximum(first_day, since.astype('datetime64[D]'))
+        span_days = (now.astype('datetime64[D]') - first_day).astype(np.int64) + 1
+        opened_at = first_day + (rng.random(count) * span_days).astype(np.int64).astype('timedelta64[D]')
+        # Records are created once the account is open (and within the batch, if incremental)
+        recorded_from = opened_at if since is None else np.maximum(opened_at.astype('datetime64[s]'), since)
+        
+        has_interest = (account_type == ACCOUNT_TYPES.index('savings')) | (account_type == ACCOUNT_TYPES.index('loan'))
+        interest_rate = np.where(has_interest, np.round(rng.uniform(0.01, 5.00, count), 4), np.nan)
+        
+        return {
+            'id': _format_ids('ACC', start + 1, count),
+            'customer_id': customer_ids[customer],
+            'account_number': _format_ids('', start + 1, count, width=18),
+            'type': DictionaryColumn(account_type.astype(np.uint8), np.array(ACCOUNT_TYPES, dtype=object)),
+            'balance': balance,
+            'opened_at': opened_at,
+            'interest_rate': interest_rate,
+            'status': DictionaryColumn(status.astype(np.uint8), np.array(ACCOUNT_STATUSES, dtype=object)),
+            'branch_id': customer_branches[customer],
+            'created_at': _random_datetimes(rng, recorded_from, now),
+            'updated_at': _random_datetimes(rng, recorded_from, now),
+        }
+    
+    def _transaction_block(self, rng, start, count, accounts, employee_ids, since=None, now=None):
+        """Transaction columns for global rows [start, start + count), dated after since if given
+        and by now (a datetime64, by default the reference time)"""
+        if now is None:
+            now = self.reference_time
+        row = start + np.arange(count)
+        account_ids, account_opened = accounts
+        
+        account = sample_parents(rng, len(account_ids), count, self._parent_cdf(len(account_ids), self.transaction_skew))
+        trans_type = rng.integers(0, len(TRANSACTION_TYPES), count)
+        completed = TRANSACTION_STATUSES.index('completed')
+        status = np.where(row < 500, rng.integers(0, len(TRANSACTION_STATUSES), count), completed)  # Most completed
+        
+        # Amount range depends on transaction type, then the same edge cases as generate_transactions
+        low, high = AMOUNT_RANGES[trans_type].T
+        amount = rng.uniform(low, high)
+        edge = row < 40
+        if edge.any():
+            deposit = trans_type[edge] == TRANSACTION_TYPES.index('deposit')
+            large = np.where(deposit, rng.uniform(100000, 1000000, len(deposit)), rng.uniform(-1000000, -100000, len(deposit)))
+            small = np.where(deposit, rng.uniform(0.01, 1.00, len(deposit)), rng.uniform(-1.00, -0.01, len(deposit)))
+            amount[edge] = np.where(row[edge] < 20, large, small)  # Very large / very small transactions
+        amount = np.round(amount, 2)
+        
+        # Transaction date should be after account opening, within the last year
+        trans_start = np.maximum(account_opened[account].astype('datetime64[s]'), now - np.timedelta64(365, 'D'))
+        if since is not None:
+            trans_start = np.maximum(trans_start, since)
+        trans_date = _random_datetimes(rng, trans_start, now)
+        
+        has_employee = rng.random(count) > 0.3
+        employee = rng.integers(0, len(employee_ids), count)
+        
+        return {
+            'id': _format_ids('TXN', start + 1, count),
+            'account_id': account_ids[account],
+            'transaction_date': trans_date,
+            'amount': amount,
+            'type': DictionaryColumn(trans_type.astype(np.uint8), np.array(TRANSACTION_TYPES, dtype=object)),
+            'description': self.get_value_pools().sample(rng, 'description', count),
+            'status': DictionaryColumn(status.astype(np.uint8), np.array(TRANSACTION_STATUSES, dtype=object)),
+            'created_at': trans_date,
+            'updated_at': _random_datetimes(rng, trans_date, now),
+            'employee_id': np.where(has_employee, employee_ids[employee], b''),
+        }
+    
+    def _account_ledger_keys(self):
+        """Account type codes (ACCOUNT_TYPES order) and balances in cents, the targets of the ledgers"""
+        types = self._key_column('accounts', 'type', object)
+        if not isinstance(types, DictionaryColumn):
+            types = DictionaryColumn.encode(types)
+        lookup = np.array([ACCOUNT_TYPES.index(value) for value in types.values], dtype=np.uint8)
+        balances = np.asarray(self._key_column('accounts', 'balance', np.float64), dtype=np.float64)
+        return lookup[types.codes], np.round(balances * 100).astype(np.int64)
+    
+    def _ledger_counts(self, account_count, count):
+        """Transactions per account in ledger mode: one opening transaction each, the rest
+        spread over accounts uniformly or Zipf-skewed like generate_transactions_vectorized"""
+        if count < account_count:
+            raise ValueError(f"Ledger mode needs at least one transaction per account "
+                             f"({count} transactions for {account_count} accounts)")
+        rng = np.random.default_rng([self.seed, TABLES.index('transactions'), account_count, count])
+        extra = sample_parents(rng, account_count, count - account_count,
+                               self._parent_cdf(account_count, self.transaction_skew))
+        return 1 + np.bincount(extra, minlength=account_count)
+    
+    def _ledger_block(self, rng, start, count, accounts, ledgers, employee_ids, per_account):
+        """Transaction columns for global rows [start, start + count) in ledger mode.
+        
+        The rows hold whole account histories (per_account transactions each, in
+        account order), each opening on the account's opening day and running in
+        time order. Completed amounts are posted to a running balance, a grouped
+        cumulative sum in cents, which is kept at or above the account type's
+        floor: postings that would go below it only go through down to the
+        floor, and those that cannot go through at all fail. The last posting
+        of each account closes its ledger on accounts.balance.
+        """
+        now = self.reference_time
+        account_ids, account_opened = accounts
+        account_types, account_balances = ledgers
+        first_rows = np.cumsum(per_account) - per_account
+        first, last = np.searchsorted(first_rows, [start, start + count])
+        sizes = per_account[first:last]
+        starts = np.cumsum(sizes) - sizes
+        group = np.repeat(np.arange(len(sizes)), sizes)
+        account = first + group
+        kind = account_types[account]
+        opening = np.zeros(count, dtype=bool)
+        opening[starts] = True
+        row = start + np.arange(count)
+        
+        # Types, statuses and raw amounts as in _transaction_block, plus the opening transaction
+        trans_type = np.where(opening, OPENING_TYPES[kind], rng.integers(0, len(TRANSACTION_TYPES), count))
+        completed = TRANSACTION_STATUSES.index('completed')
+        status = np.where((row < 500) & ~opening, rng.integers(0, len(TRANSACTION_STATUSES), count), completed)
+        low, high = np.where(opening[:, None], OPENING_RANGES[kind], AMOUNT_RANGES[trans_type]).T
+        amount = np.round(rng.uniform(low, high) * 100).astype(np.int64)
+        
+        # Histories open on the opening day and then run in time order
+        opened = account_opened[account].astype('datetime64[s]')
+        opened_at = np.minimum(opened + rng.integers(0, 86400, count).astype('timedelta64[s]'), now)
+        trans_date = np.where(opening, opened_at, _random_datetimes(rng, opened_at[starts][group], now))
+        order = np.lexsort((~opening, trans_date, group))
+        trans_type, status, amount, trans_date = trans_type[order], status[order], amount[order], trans_date[order]
+        
+        # Running balance of the completed postings, lifted back to the floor whenever it would go below
+        posted = status == completed
+        floor = np.round(LEDGER_FLOORS * 100).astype(np.int64)[kind]
+        balance = _grouped_cumsum(np.where(posted, amount, 0), starts)
+        balance += _grouped_cummax(np.maximum(floor - balance, 0), group)
+        posted_amount = np.diff(balance, prepend=0)
+        posted_amount[starts] = balance[starts]
+        # Close each ledger on the account's balance with its last posting
+        last_posted = np.maximum.reduceat(np.where(posted, np.arange(count), -1), starts)
+        posted_amount[last_posted] += account_balances[first:last] - balance[last_posted]
+        
+        # Postings the floor stopped entirely fail and keep their requested amount
+        declined = posted & (posted_amount == 0) & (amount != 0)
+        status[declined] = TRANSACTION_STATUSES.index('failed')
+        applied = posted & ~declined
+        amount = np.where(applied, posted_amount, amount)
+        # Posted amounts may have been cut or changed sign: relabel the types that no longer fit
+        credit = np.isin(trans_type, [TRANSACTION_TYPES.index('deposit'), TRANSACTION_TYPES.index('interest')])
+        debit = np.isin(trans_type, [TRANSACTION_TYPES.index('withdrawal'), TRANSACTION_TYPES.index('fee')])
+        trans_type[applied & debit & (amount > 0)] = TRANSACTION_TYPES.index('deposit')
+        trans_type[applied & credit & (amount < 0)] = TRANSACTION_TYPES.index('withdrawal')
+        
+        has_employee = rng.random(count) > 0.3
+        employee = rng.integers(0, len(employee_ids), count)
+        
+        return {
+            'id': _format_ids('TXN', start + 1, count),
+            'account_id': account_ids[account],
+            'transaction_date': trans_date,
+            'amount': amount / 100,
+            'type': DictionaryColumn(trans_type.astype(np.uint8), np.array(TRANSACTION_TYPES, dtype=object)),
+            'description': self.get_value_pools().sample(rng, 'description', count),
+            'status': DictionaryColumn(status.astype(np.uint8), np.array(TRANSACTION_STATUSES, dtype=object)),
+            'created_at': trans_date,
+            'updated_at': _random_datetimes(rng, trans_date, now),
+            'employee_id': np.where(has_employee, employee_ids[employee], b''),
+        }
+    
+    def reconcile_ledger(self):
+        """Ids of accounts whose balance differs from the sum of their completed transactions"""
+        if 'accounts' not in self.index.ids:
+            self.build_index()
+        account_ids = self.index.ids['accounts']
+        rows = self.index.rows('accounts', self._key_column('transactions', 'account_id'))
+        cents = np.round(self._key_column('transactions', 'amount', np.float64) * 100)
+        status = self._key_column('transactions', 'status', object)
+        if isinstance(status, DictionaryColumn):
+            status = status.values[status.codes]
+        completed = status == 'completed'
+        posted = np.bincount(rows[completed], weights=cents[completed], minlength=len(account_ids))
+        return account_ids[posted != self._account_ledger_keys()[1]]
+    
+    def generate_accounts_vectorized(self, count=3000):
+        """Generate account data as NumPy columns in a single pass"""
+        print(f"Generating {count} accounts (vectorized)...")
+        self.columns['accounts'] = self._account_block(self.rng, 0, count, self._customer_keys())
+    
+    def generate_transactions_vectorized(self, count=15000):
+        """Generate transaction data as NumPy columns in a single pass (as account ledgers if ledger)"""
+        print(f"Generating {count} transactions (vectorized{', ledger' if self.ledger else ''})...")
+        if self.ledger:
+            accounts = self._account_keys()
+            self.columns['transactions'] = self._ledger_block(
+                self.rng, 0, count, accounts, self._account_ledger_keys(), self._employee_keys(),
+                self._ledger_counts(len(accounts[0]), count))
+            return
+        self.columns['transactions'] = self._transaction_block(
+            self.rng, 0, count, self._account_keys(), self._employee_keys())
+    
+    def _shard_seed(self, table, shard):
+        """Seed sequence for one shard of a table, derived from the master seed"""
+        return np.random.SeedSequence([self.seed, TABLES.index(table), shard])
+    
+    def _branch_ids(self):
+        """Branch ids customers are assigned to"""
+        return [b.decode('ascii') for b in self._key_column('branches', 'id').tolist()]
+    
+    def generate_shard(self, table, shard, start, count):
+        """Generate global rows [start, start + count) of a table from the shard's own seed.
+        
+        The result depends only on the master seed, the reference time, the
+        parent keys and the shard boundaries, never on which process runs it.
+        """
+        seed_seq = self._shard_seed(table, shard)
+        if table == 'customers':
+            rnd = random.Random(int(seed_seq.generate_state(1)[0]))
+            branch_ids = self._branch_ids()
+            return records_to_columns('customers', [self._make_customer(i, rnd, branch_ids)
+                                                    for i in range(start, start + count)])
+        rng = np.random.default_rng(seed_seq)
+        if table == 'accounts':
+            return self._account_block(rng, start, count, self._customer_keys())
+        if table == 'transactions' and self.ledger:
+            return self._ledger_block(rng, start, count, self._account_keys(), self._account_ledger_keys(),
+                                      self._employee_keys(), self.keys['ledger']['transactions'])
+        if table == 'transactions':
+            return self._transaction_block(rng, start, count, self._account_keys(), self._employee_keys())
+        raise ValueError(f"Table {table!r} is not generated in shards")
+    
+    def _shard_ranges(self, table, count, chunk_size):
+        """(start, count) row ranges of a table's shards.
+        
+        Ledger transactions are sharded on account boundaries, about chunk_size
+        rows each, so every account's history is generated in one shard.
+        """
+        if table != 'transactions' or not self.ledger:
+            return [(start, min(chunk_size, count - start)) for start in range(0, count, chunk_size)]
+        per_account = self.keys['ledger']['transactions']
+        first_rows = np.cumsum(per_account) - per_account
+        boundaries = np.flatnonzero(np.diff(first_rows // chunk_size)) + 1
+        starts = first_rows[np.concatenate([[0], boundaries])].tolist()
+        return [(start, end - start) for start, end in zip(starts, starts[1:] + [count])]
+    
+    def iter_shards(self, table, count, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        """Yield the shards of a table in order, generating them on a process pool if workers > 1"""
+        tasks = [(table, shard, start, size)
+                 for shard, (start, size) in enumerate(self._shard_ranges(table, count, chunk_size))]
+        if workers <= 1:
+            for task in tasks:
+                yield self.generate_shard(*task)
+            return
+        
+        # Workers rebuild the generator from its seed, reference time, parent keys and value pools
+        with multiprocessing.Pool(workers, initializer=_init_shard_worker,
+                                  initargs=(self.seed, self.now, self.transaction_skew, self.ledger, self.keys,
+                                            self.get_value_pools())) as pool:
+            tasks = iter(tasks)
+            # Keep a bounded number of shards in flight so memory stays flat
+            pending = deque(pool.apply_async(_generate_shard, task)
+                            for task in itertools.islice(tasks, 2 * workers))
+            while pending:
+                chunk = pending.popleft().get()
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(pool.apply_async(_generate_shard, task))
+                yield chunk
+    
+    def iter_customer_chunks(self, count=2000, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        """Yield customer columns chunk by chunk, keeping only their parent keys"""
+        ids, branch_ids, created = [], [], []
+        for chunk in self.iter_shards('customers', count, chunk_size, workers):
+            ids.append(chunk['id'])
+            branch_ids.append(chunk['branch_id'])
+            created.append(chunk['created_at'].astype('datetime64[s]'))
+            yield chunk
+        self.keys['customers'] = {
+            'id': np.concatenate(ids),
+            'branch_id': np.concatenate(branch_ids),
+            'created_at': np.concatenate(created),
+        }
+    
+    def iter_account_chunks(self, count=3000, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        """Yield account columns chunk by chunk, keeping only their parent keys"""
+        ids = np.empty(count, dtype='S13')
+        customer_ids = np.empty(count, dtype='S14')
+        opened = np.empty(count, dtype='datetime64[D]')
+        types = np.empty(count, dtype=np.uint8)
+        balances = np.empty(count, dtype=np.float64)
+        start = 0
+        for chunk in self.iter_shards('accounts', count, chunk_size, workers):
+            size = len(chunk['id'])
+            ids[start:start + size] = chunk['id']
+            customer_ids[start:start + size] = chunk['customer_id']
+            opened[start:start + size] = chunk['opened_at']
+            types[start:start + size] = chunk['type'].codes
+            balances[start:start + size] = chunk['balance']
+            start += size
+            yield chunk
+        self.keys['accounts'] = {
+            'id': ids,
+            'customer_id': customer_ids,
+            'opened_at': opened,
+            # Ledger targets
+            'type': DictionaryColumn(types, np.array(ACCOUNT_TYPES, dtype=object)),
+            'balance': balances,
+        }
+    
+    def iter_transaction_chunks(self, count=15000, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        """Yield transaction columns chunk by chunk (nothing is retained)"""
+        if self.ledger:
+            # Shards need every account's transaction count to find their accounts
+            self.keys['ledger'] = {'transactions': self._ledger_counts(len(self._account_keys()[0]), count)}
+        yield from self.iter_shards('transactions', count, chunk_size, workers)
+    
+    def iter_table_chunks(self, counts=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        """Yield (table, chunk) pairs for every table in foreign key order.
+        
+        Branches and employees are small dimension tables and are generated up
+        front (branches need their manager assigned from employees). Customers,
+        accounts and transactions are produced chunk by chunk; only their key
+        arrays stay resident, so memory does not grow with the transaction count.
+        
+        Each chunk is a shard with its own seed, so for a given seed, reference
+        time and chunk_size the output is identical for any number of workers.
+        """
+        counts = {**DEFAULT_COUNTS, **(counts or {})}
+        self.row_counts = dict(counts)
+        print(f"Streaming data generation in chunks of {chunk_size} ({workers} worker(s))...")
+        self.generate_branches(counts['branches'])
+        self.generate_employees(counts['employees'])
+        self.keys['branches'] = {'id': np.array([b['id'] for b in self.branches], dtype='S')}
+        self.keys['employees'] = {'id': self._employee_keys(), 'branch_id': self._employee_branches()}
+        yield 'branches', self.branches
+        yield 'employees', self.employees
+        
+        print(f"Generating {counts['customers']} customers...")
+        for chunk in self.iter_customer_chunks(counts['customers'], chunk_size, workers):
+            yield 'customers', chunk
+        print(f"Generating {counts['accounts']} accounts (vectorized)...")
+        for chunk in self.iter_account_chunks(counts['accounts'], chunk_size, workers):
+            yield 'accounts', chunk
+        self.build_index()
+        print(f"Generating {counts['transactions']} transactions (vectorized{', ledger' if self.ledger else ''})...")
+        for chunk in self.iter_transaction_chunks(counts['transactions'], chunk_size, workers):
+            yield 'transactions', chunk
+    
+    def stream_to(self, writers, counts=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+        """Generate every table chunk by chunk and feed each chunk to all writers.
+        
+        Telemetry gets, per table, a 'generate' stage (everything the generator
+        did before yielding the table's chunks, including the wait for pool
+        workers, so branches include the employees built up front) and one
+        'write' stage per writer, plus chunk progress. The value pools are
+        built first, under their own 'value_pools' stage.
+        """
+        telemetry = self.telemetry
+        totals = {**DEFAULT_COUNTS, **(counts or {})}
+        names = [type(writer).__name__ for writer in writers]
+        current, rows, seconds = None, 0, [0.0] * (len(writers) + 1)
+        
+        def record_table():
+            telemetry.record('generate', seconds[0], current, rows)
+            for name, spent in zip(names, seconds[1:]):
+                telemetry.record('write', spent, current, rows, writer=name)
+        
+        try:
+            # Build the pools up front so they are not timed as branch generation too
+            self.get_value_pools()
+            started = time.perf_counter()
+            for table, chunk in self.iter_table_chunks(counts, chunk_size, workers):
+                if table != current:
+                    if current is not None:
+                        record_table()
+                    current, rows, seconds = table, 0, [0.0] * (len(writers) + 1)
+                    telemetry.progress(table, 0, totals[table])
+                now = time.perf_counter()
+                seconds[0] += now - started
+                for i, writer in enumerate(writers, 1):
+                    writer.write(table, chunk)
+                    started, now = now, time.perf_counter()
+                    seconds[i] += now - started
+                rows += chunk_length(chunk)
+                telemetry.progress(table, rows, totals[table])
+                started = time.perf_counter()
+            if current is not None:
+                record_table()
+        finally:
+            for name, writer in zip(names, writers):
+                with telemetry.stage('close', writer=name):
+                    writer.close()
+        print("Streaming data generation completed!")
+    
+    def _delta_seed(self, table, batch):
+        """Seed sequence for one table of an incremental batch (spawn_key keeps it apart from the shards)"""
+        return np.random.SeedSequence([self.seed, TABLES.index(table), batch], spawn_key=(1,))
+    
+    def _state_keys(self):
+        """Parent keys incremental batches build on, from whichever generation mode produced them"""
+        customer_ids, customer_branches, customer_created = self._customer_keys()
+        account_ids, account_opened = self._account_keys()
+        return {
+            'branches': {'id': self._key_column('branches', 'id')},
+            'employees': {'id': self._employee_keys(), 'branch_id': self._employee_branches()},
+            'customers': {'id': customer_ids, 'branch_id': customer_branches, 'created_at': customer_created},
+            'accounts': {'id': account_ids, 'customer_id': self._account_customers(), 'opened_at': account_opened},
+        }
+    
+    def save_state(self, path, output=None):
+        """Persist what incremental batches resume from: the seed and settings, the reference
+        time reached, row counts (the id counters), the batch number and the parent keys.
+        
+        Ids, emails, national ids and account numbers derive from row counters,
+        and each batch draws from its own seed, so no uniqueness sets or RNG
+        states need saving. output (JSON, e.g. the delta files and their flushed
+        sizes) is kept with the state so a resumed run can drop what was written
+        after it. Written to an .npz file renamed into place.
+        """
+        if self.ledger:
+            raise ValueError("Ledger histories close on a fixed balance and cannot be extended incrementally")
+        meta = {
+            'seed': self.seed,
+            'reference_time': self.now.isoformat(),
+            'transaction_skew': self.transaction_skew,
+            'locale': self.locale,
+            'row_counts': {table: int(count) for table, count in self.row_counts.items()},
+            'delta_batch': self.delta_batch,
+            'output': output,
+        }
+        arrays = {f"{table}/{column}": values
+                  for table, columns in self._state_keys().items() for column, values in columns.items()}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, 'wb') as out:
+            np.savez(out, state=np.array(json.dumps(meta)), **arrays)
+        os.replace(partial, path)
+    
+    @classmethod
+    def load_state(cls, path, pool_cache_dir=None):
+        """Rebuild a generator from save_state, ready to emit the next incremental batch"""
+        with np.load(path) as data:
+            meta = json.loads(str(data['state']))
+            keys = {}
+            for name in data.files:
+                if name != 'state':
+                    table, column = name.split('/')
+                    keys.setdefault(table, {})[column] = data[name]
+        generator = cls(seed=meta['seed'], reference_time=datetime.fromisoformat(meta['reference_time']),
+                        transaction_skew=meta['transaction_skew'], locale=meta['locale'],
+                        pool_cache_dir=pool_cache_dir)
+        generator.keys = keys
+        generator.row_counts = meta['row_counts']
+        generator.delta_batch = meta['delta_batch']
+        generator.saved_output = meta.get('output')
+        return generator
+    
+    def iter_delta_chunks(self, counts, step):
+        """Yield (table, chunk) pairs of the next incremental batch and advance the state.
+        
+        The reference time moves forward by step: new customers register,
+        new accounts open and new transactions are dated between the previous
+        reference time and the new one. Ids continue from the row counts, and
+        new customers and accounts join the parent keys of later batches.
+        
+        The state (reference time, row counts, keys and batch number) only
+        changes after the last chunk, all at once, so a batch abandoned halfway
+        leaves it untouched and saving it then replays the same batch.
+        
+        Timestamps have whole-second resolution, so step must be at least one
+        second; fractions carry over to later batches through self.now.
+        """
+        if self.ledger:
+            raise ValueError("Ledger histories close on a fixed balance and cannot be extended incrementally")
+        if step < timedelta(seconds=1):
+            raise ValueError(f"Incremental step {step} is shorter than the one-second timestamp resolution")
+        keys = self._state_keys()
+        since = self.reference_time
+        until = self.now + step
+        now = np.datetime64(until, 's')
+        
+        count, start = counts.get('customers', 0), self.row_counts['customers']
+        if count:
+            rnd = random.Random(int(self._delta_seed('customers', self.delta_batch).generate_state(1)[0]))
+            branch_ids = [b.decode('ascii') for b in keys['branches']['id'].tolist()]
+            since_time = since.astype(datetime)
+            chunk = records_to_columns('customers', [self._make_customer(i, rnd, branch_ids, since_time, until)
+                                                     for i in range(start, start + count)])
+            keys['customers'] = {
+                'id': np.concatenate([keys['customers']['id'], chunk['id']]),
+                'branch_id': np.concatenate([keys['customers']['branch_id'], chunk['branch_id']]),
+                'created_at': np.concatenate([keys['customers']['created_at'],
+                                              chunk['created_at'].astype('datetime64[s]')]),
+            }
+            yield 'customers', chunk
+        
+        count, start = counts.get('accounts', 0), self.row_counts['accounts']
+        if count:
+            rng = np.random.default_rng(self._delta_seed('accounts', self.delta_batch))
+            customers = keys['customers']['id'], keys['customers']['branch_id'], keys['customers']['created_at']
+            chunk = self._account_block(rng, start, count, customers, since, now)
+            keys['accounts'] = {column: np.concatenate([values, chunk[column]])
+                                for column, values in keys['accounts'].items()}
+            yield 'accounts', chunk
+        
+        count, start = counts.get('transactions', 0), self.row_counts['transactions']
+        if count:
+            rng = np.random.default_rng(self._delta_seed('transactions', self.delta_batch))
+            accounts = keys['accounts']['id'], keys['accounts']['opened_at']
+            yield 'transactions', self._transaction_block(rng, start, count, accounts, keys['employees']['id'],
+                                                          since, now)
+        
+        self.now, self.reference_time = until, now
+        for table in DELTA_TABLES:
+            self.row_counts[table] += counts.get(table, 0)
+        self.keys = keys
+        self.delta_batch += 1
+        # The index no longer covers every row; build_index() rebuilds it when a lookup needs it
+        self.index = RelationalIndex()
+        # Account counts change with every batch, so cached Zipf weights would only pile up
+        self._parent_cdfs.clear()
+    
+    def compact(self):
+        """Move every row-by-row table into compact columnar storage, freeing the row dicts"""
+        for table in TABLES:
+            rows = getattr(self, table)
+            if rows and table not in self.columns:
+                self.columns[table] = records_to_columns(table, rows)
+                setattr(self, table, [])
+    
+    def table_data(self, table):
+        """A table's generated rows: its column mapping if vectorized, else the list of dicts"""
+        return self.columns.get(table, getattr(self, table))
+    
+    def count_records(self, table):
+        """Number of generated rows in a table"""
+        return chunk_length(self.table_data(table))
+    
+    def generate_all_data(self, vectorized=False, compact=False, counts=None):
+        """Generate all test data (accounts and transactions as NumPy columns if vectorized,
+        everything in compact columnar storage if compact); counts overrides DEFAULT_COUNTS"""
+        counts = {**DEFAULT_COUNTS, **(counts or {})}
+        self.row_counts = dict(counts)
         print("Starting data generation...")
-        self.generate_branches(50)
-        self.generate_employees(500)
-        self.generate_customers(2000)
-        self.generate_accounts(3000)
-        self.generate_transactions(15000)
+        stage = self.telemetry.stage
+        # Build the pools up front so they are not timed as branch generation too
+        self.get_value_pools()
+        with stage('generate', 'branches', counts['branches']):
+            self.generate_branches(counts['branches'])
+        with stage('generate', 'employees', counts['employees']):
+            self.generate_employees(counts['employees'])
+        with stage('generate', 'customers', counts['customers']):
+            self.generate_customers(counts['customers'])
+        with stage('generate', 'accounts', counts['accounts']):
+            if vectorized:
+                self.generate_accounts_vectorized(counts['accounts'])
+            else:
+                self.generate_accounts(counts['accounts'])
+            self.build_index()
+        with stage('generate', 'transactions', counts['transactions']):
+            if vectorized or self.ledger:
+                # Ledgers are only generated vectorized
+                self.generate_transactions_vectorized(counts['transactions'])
+            else:
+                self.generate_transactions(counts['transactions'])
+        if compact:
+            with stage('compact'):
+                self.compact()
         print("Data generation completed!")
         
         # Print summary
+        counts = {table: self.count_records(table) for table in TABLES}
         print(f"\nData Summary:")
-        print(f"Branches: {len(self.branches)}")
-        print(f"Employees: {len(self.employees)}")
-        print(f"Customers: {len(self.customers)}")
-        print(f"Accounts: {len(self.accounts)}")
-        print(f"Transactions: {len(self.transactions)}")
-        print(f"Total records: {len(self.branches) + len(self.employees) + len(self.customers) + len(self.accounts) + len(self.transactions)}")
-    
-    def generate_sql_inserts(self, filename="banking_test_data_new.sql"):
-        """Generate SQL INSERT statements"""
-        print(f"Generating SQL INSERT statements to {filename}...")
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("-- Banking System Test Data\n")
-            f.write("-- Generated test data with relational integrity\n\n")
-            
-            # Branches
-            f.write("-- Insert Branches\n")
-            for branch in self.branches:
-                values = [
-                    f"'{branch['id']}'",
-                    f"'{branch['name']}'",
-                    f"'{branch['address']}'" if branch['address'] else "NULL",
-                    f"'{branch['city']}'",
-                    f"'{branch['state']}'",
-                    f"'{branch['zip_code']}'",
-                    f"'{branch['manager_id']}'" if branch['manager_id'] else "NULL",
-                    f"'{branch['created_at']}'",
-                    f"'{branch['updated_at']}'"
-                ]
-                f.write(f"INSERT INTO branches (id, name, address, city, state, zip_code, manager_id, created_at, updated_at) VALUES ({', '.join(values)});\n")
-            
-            f.write("\n-- Insert Employees\n")
-            for employee in self.employees:
-                values = [
-                    f"'{employee['id']}'",
-                    f"'{employee['branch_id']}'",
-                    f"'{employee['name']}'",
-                    f"'{employee['email']}'",
-                    f"'{employee['phone']}'" if employee['phone'] else "NULL",
-                    f"'{employee['position']}'",
-                    f"'{employee['hire_date']}'",
-                    f"{employee['salary']}",
-                    f"'{employee['created_at']}'",
-                    f"'{employee['updated_at']}'"
-                ]
-                f.write(f"INSERT INTO employees (id, branch_id, name, email, phone, position, hire_date, salary, created_at, updated_at) VALUES ({', '.join(values)});\n")
-            
-            f.write("\n-- Insert Customers\n")
-            for customer in self.customers:
-                values = [
-                    f"'{customer['id']}'",
-                    f"'{customer['email']}'",
-                    f"'{customer['phone']}'" if customer['phone'] else "NULL",
-                    f"'{customer['address']}'" if customer['address'] else "NULL",
-                    f"'{customer['first_name']}'",
-                    f"'{customer['last_name']}'",
-                    f"'{customer['date_of_birth']}'",
-                    f"'{customer['gender']}'",
-                    f"'{customer['national_id']}'",
-                    f"'{customer['created_at']}'",
-                    f"'{customer['updated_at']}'",
-                    f"'{customer['branch_id']}'"
-                ]
-                f.write(f"INSERT INTO customers (id, email, phone, address, first_name, last_name, date_of_birth, gender, national_id, created_at, updated_at, branch_id) VALUES ({', '.join(values)});\n")
-            
-            f.write("\n-- Insert Accounts\n")
-            for account in self.accounts:
-                values = [
-                    f"'{account['id']}'",
-                    f"'{account['customer_id']}'",
-                    f"'{account['account_number']}'",
-                    f"'{account['type']}'",
-                    f"{account['balance']}",
-                    f"'{account['opened_at']}'",
-                    f"{account['interest_rate']}" if account['interest_rate'] else "NULL",
-                    f"'{account['status']}'",
-                    f"'{account['branch_id']}'",
-                    f"'{account['created_at']}'",
-                    f"'{account['updated_at']}'"
-                ]
-                f.write(f"INSERT INTO accounts (id, customer_id, account_number, type, balance, opened_at, interest_rate, status, branch_id, created_at, updated_at) VALUES ({', '.join(values)});\n")
-            
-            f.write("\n-- Insert Transactions\n")
-            for transaction in self.transactions:
-                values = [
-                    f"'{transaction['id']}'",
-                    f"'{transaction['account_id']}'",
-                    f"'{transaction['transaction_date']}'",
-                    f"{transaction['amount']}",
-                    f"'{transaction['type']}'",
-                    f"'{transaction['description']}'",
-                    f"'{transaction['status']}'",
-                    f"'{transaction['created_at']}'",
-                    f"'{transaction['updated_at']}'",
-                    f"'{transaction['employee_id']}'" if transaction['employee_id'] else "NULL"
-                ]
-                f.write(f"INSERT INTO transactions (id, account_id, transaction_date, amount, type, description, status, created_at, updated_at, employee_id) VALUES ({', '.join(values)});\n")
-        
-        print(f"SQL INSERT statements generated successfully!")
+        for table, count in counts.items():
+            print(f"{table.capitalize()}: {count}")
+        print(f"Total records: {sum(counts.values())}")
+    
+    def generate_sql_inserts(self, filename="banking_test_data_new.sql", mode='insert', batch_size=1):
+        """Generate SQL INSERT statements (batch_size rows per statement), a COPY script or CSV files"""
+        print(f"Generating SQL ({mode}) output to {filename}...")
+        self.write_tables(make_sql_writer(mode, filename, batch_size))
+        print(f"SQL output generated successfully!")
     
     def export_to_excel(self, filename="banking_test_data_now.xlsx"):
         """Export all data to Excel with separate sheets"""
         print(f"Exporting data to Excel file: {filename}...")
-        
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            # Create DataFrames and export to different sheets
-            branches_df = pd.DataFrame(self.branches)
-            employees_df = pd.DataFrame(self.employees)
-            customers_df = pd.DataFrame(self.customers)
-            accounts_df = pd.DataFrame(self.accounts)
-            transactions_df = pd.DataFrame(self.transactions)
-            
-            # Export each table to a separate sheet
-            branches_df.to_excel(writer, sheet_name='Branches', index=False)
-            employees_df.to_excel(writer, sheet_name='Employees', index=False)
-            customers_df.to_excel(writer, sheet_name='Customers', index=False)
-            accounts_df.to_excel(writer, sheet_name='Accounts', index=False)
-            transactions_df.to_excel(writer, sheet_name='Transactions', index=False)
-            
-            # Create summary sheet
-            summary_data = {
-                'Table': ['Branches', 'Employees', 'Customers', 'Accounts', 'Transactions', 'Total'],
-                'Record Count': [len(self.branches), len(self.employees), len(self.customers), 
-                               len(self.accounts), len(self.transactions), 
-                               len(self.branches) + len(self.employees) + len(self.customers) + len(self.accounts) + len(self.transactions)]
-            }
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Format the Excel file
-        wb = openpyxl.load_workbook(filename)
-        
-        # Format headers
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            for cell in ws[1]:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        
-        wb.save(filename)
+        self.write_tables(ExcelSheetWriter(filename))
         print(f"Excel file exported successfully!")
+    
+    def export_to_columnar(self, directory="banking_test_data_parquet", file_format='parquet'):
+        """Export all data to one Parquet or Arrow IPC file per table"""
+        print(f"Exporting data to {file_format} files in {directory}...")
+        self.write_tables(ColumnarFileWriter(directory, file_format))
+        print(f"Columnar export completed!")
+    
+    def write_tables(self, writer):
+        """Feed every generated table to a writer as a single chunk, then close it"""
+        name = type(writer).__name__
+        try:
+            for table in TABLES:
+                with self.telemetry.stage('write', table, self.count_records(table), writer=name):
+                    writer.write(table, self.table_data(table))
+        finally:
+            with self.telemetry.stage('close', writer=name):
+                writer.close()
+
+
+# Generator rebuilt once per pool worker by _init_shard_worker
+_shard_generator = None
+
+
+def _init_shard_worker(seed, reference_time, transaction_skew, ledger, keys, value_pools):
+    """Pool initializer: rebuild the generator state needed to produce shards"""
+    global _shard_generator
+    _shard_generator = BankingDataGenerator(seed=seed, reference_time=reference_time,
+                                            transaction_skew=transaction_skew, ledger=ledger)
+    _shard_generator.keys = keys
+    _shard_generator._value_pools = value_pools
+
+
+def _generate_shard(table, shard, start, count):
+    """Pool task: generate one shard in a worker process"""
+    return _shard_generator.generate_shard(table, shard, start, count)
+
+
+def _flush_files(files):
+    """Write buffered text through to disk; return each file's size, the point a resumed run truncates to"""
+    sizes = {}
+    for file in files:
+        file.flush()
+        os.fsync(file.fileno())
+        sizes[file.name] = os.fstat(file.fileno()).st_size
+    return sizes
+
+
+class SqlInsertWriter:
+    """Write table chunks as SQL INSERT statements, batch_size rows per statement"""
+    
+    def __init__(self, filename, batch_size=1):
+        self.file = open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self.file.write("-- Banking System Test Data\n")
+        self.file.write("-- Generated test data with relational integrity\n\n")
+        self.batch_size = batch_size
+        self.started = []
+    
+    def write(self, table, chunk):
+        if table not in self.started:
+            separator = "\n" if self.started else ""
+            self.file.write(f"{separator}-- Insert {table.capitalize()}\n")
+            self.started.append(table)
+        prefix = f"INSERT INTO {table} ({', '.join(TABLE_COLUMNS[table])}) VALUES "
+        rows = [f"({', '.join(row)})" for row in chunk_literals(table, chunk)]
+        if self.batch_size <= 1:
+            self.file.write(''.join(f"{prefix}{row};\n" for row in rows))
+            return
+        # Multi-row INSERT ... VALUES (...),(...); statements
+        for start in range(0, len(rows), self.batch_size):
+            self.file.write(f"{prefix}\n" + ",\n".join(rows[start:start + self.batch_size]) + ";\n")
+    
+    def flush(self):
+        return _flush_files([self.file])
+    
+    def close(self):
+        self.file.close()
+
+
+class PostgresCopyWriter:
+    """Write table chunks as a psql script of COPY ... FROM stdin blocks (text format)"""
+    
+    def __init__(self, filename):
+        self.file = open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self.file.write("-- Banking System Test Data\n")
+        self.file.write("-- Generated test data with relational integrity\n\n")
+        self.current = None
+    
+    def write(self, table, chunk):
+        if table != self.current:
+            self._end_block()
+            self.file.write(f"COPY {table} ({', '.join(TABLE_COLUMNS[table])}) FROM stdin;\n")
+            self.current = table
+        self.file.write(''.join('\t'.join(row) + '\n' for row in chunk_copy_fields(table, chunk)))
+    
+    def _end_block(self):
+        if self.current is not None:
+            self.file.write("\\.\n\n")
+    
+    def flush(self):
+        # End the open COPY block so the script is complete up to this point
+        self._end_block()
+        self.current = None
+        return _flush_files([self.file])
+    
+    def close(self):
+        self._end_block()
+        self.file.close()
+
+
+class CsvWriter:
+    """Write each table to <directory>/<table>.csv with a header row; NULL is an empty field"""
+    
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.files = {}
+    
+    def write(self, table, chunk):
+        if table not in self.files:
+            self.files[table] = open(os.path.join(self.directory, f"{table}.csv"), 'w', encoding='utf-8',
+                                     newline='', buffering=WRITE_BUFFER_SIZE)
+            self.files[table].write(','.join(TABLE_COLUMNS[table]) + '\n')
+        self.files[table].write(''.join(','.join(row) + '\n' for row in chunk_csv_fields(table, chunk)))
+    
+    def flush(self):
+        return _flush_files(self.files.values())
+    
+    def close(self):
+        for file in self.files.values():
+            file.close()
+
+
+def make_sql_writer(mode, filename, batch_size=1):
+    """Writer for one of SQL_OUTPUTS' modes: 'insert' statements, Postgres 'copy' script or 'csv' files"""
+    if mode == 'insert':
+        return SqlInsertWriter(filename, batch_size)
+    if mode == 'copy':
+        return PostgresCopyWriter(filename)
+    if mode == 'csv':
+        return CsvWriter(filename)
+    raise ValueError(f"Unknown SQL output mode {mode!r}")
+
+
+class ExcelSheetWriter:
+    """Stream table chunks into a write-only workbook: one sheet per table, plus a Summary sheet.
+    
+    Rows go straight to disk as they are appended and headers are styled as
+    they are written, so the workbook is never reloaded. Tables longer than an
+    Excel sheet continue on "<Table> 2", "<Table> 3", ... sheets.
+    """
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheets = {}
+        self.rows = {}
+    
+    def _header(self, sheet, names):
+        header = []
+        for name in names:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            header.append(cell)
+        sheet.append(header)
+    
+    def _sheet(self, table):
+        # Start a new sheet for the first rows of a table and whenever the current one is full
+        written = self.rows.get(table, 0)
+        if written % EXCEL_MAX_DATA_ROWS == 0:
+            part = written // EXCEL_MAX_DATA_ROWS + 1
+            title = table.capitalize() if part == 1 else f"{table.capitalize()} {part}"
+            self.sheets[table] = self.workbook.create_sheet(title)
+            self._header(self.sheets[table], TABLE_COLUMNS[table])
+        return self.sheets[table]
+    
+    def write(self, table, chunk):
+        for row in chunk_values(table, chunk):
+            self._sheet(table).append(row)
+            self.rows[table] = self.rows.get(table, 0) + 1
+    
+    def close(self):
+        # Create summary sheet
+        summary = self.workbook.create_sheet('Summary')
+        self._header(summary, ['Table', 'Record Count'])
+        for table, count in self.rows.items():
+            summary.append([table.capitalize(), count])
+        summary.append(['Total', sum(self.rows.values())])
+        self.workbook.save(self.filename)
+
+
+class ColumnarFileWriter:
+    """Write each table to <directory>/<table>.parquet or .arrow (Arrow IPC, memory-mappable).
+    
+    Requires pyarrow. Chunks are appended as record batches, so nothing beyond
+    the current chunk is held in memory.
+    """
+    
+    def __init__(self, directory, file_format='parquet'):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("Parquet/Arrow export requires pyarrow (pip install pyarrow)") from None
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format {file_format!r}")
+        os.makedirs(directory, exist_ok=True)
+        self.pa = pyarrow
+        self.directory = directory
+        self.file_format = file_format
+        self.writers = {}
+        self.schemas = {}
+    
+    def _arrow_table(self, table, chunk):
+        pa = self.pa
+        if not isinstance(chunk, dict):
+            return pa.Table.from_pylist(chunk).select(TABLE_COLUMNS[table])
+        arrays = []
+        for name in TABLE_COLUMNS[table]:
+            values = chunk[name]
+            if isinstance(values, DictionaryColumn):
+                dictionary = pa.array(values.values.tolist(), type=pa.string())
+                indices = pa.array(values.codes.astype(np.int32))
+                encoded = pa.DictionaryArray.from_arrays(indices, dictionary)
+                # Arrow IPC files allow a single dictionary per field, but each chunk has its own
+                arrays.append(encoded if self.file_format == 'parquet' else encoded.cast(pa.string()))
+            elif values.dtype.kind == 'S':
+                # Fixed-width ASCII ids; b'' marks a missing foreign key
+                arrays.append(pa.array(values, type=pa.binary(), mask=values == b'').cast(pa.string()))
+            elif values.dtype.kind == 'M':
+                unit = np.datetime_data(values.dtype)[0]
+                arrays.append(pa.array(values, type=pa.date32() if unit == 'D' else pa.timestamp(unit)))
+            elif values.dtype.kind == 'O':
+                arrays.append(pa.array(values.tolist(), type=pa.string()))
+            else:
+                arrays.append(pa.array(values, from_pandas=True))
+        return pa.Table.from_arrays(arrays, names=TABLE_COLUMNS[table])
+    
+    def write(self, table, chunk):
+        data = self._arrow_table(table, chunk)
+        if table not in self.writers:
+            path = os.path.join(self.directory, f"{table}.{self.file_format}")
+            if self.file_format == 'parquet':
+                import pyarrow.parquet
+                self.writers[table] = pyarrow.parquet.ParquetWriter(path, data.schema)
+            else:
+                self.writers[table] = self.pa.ipc.new_file(path, data.schema)
+            self.schemas[table] = data.schema
+        # Later chunks follow the first chunk's schema (e.g. an all-null column in one chunk)
+        self.writers[table].write_table(data.cast(self.schemas[table]))
+    
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
 
 # Main execution
 if __name__ == "__main__":
-    # Generate test data
-    generator = BankingDataGenerator()
-    generator.generate_all_data()
+    parser = argparse.ArgumentParser(description="Generate banking test data")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="generate accounts and transactions as NumPy columns")
+    parser.add_argument('--compact', action='store_true',
+                        help="keep generated tables in compact columnar storage instead of row dicts")
+    parser.add_argument('--seed', type=int, default=42, help="random seed for all generators")
+    parser.add_argument('--stream', action='store_true',
+                        help="generate and write tables chunk by chunk with bounded memory")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk when streaming")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes generating chunks when streaming (output does not depend on it)")
+    parser.add_argument('--reference-time', type=datetime.fromisoformat,
+                        help="fixed 'now' (ISO format) for byte-identical output across runs")
+    parser.add_argument('--transaction-skew', type=float, default=0.0,
+                        help="Zipf exponent of transactions per account (0 = uniform)")
+    parser.add_argument('--ledger', action='store_true',
+                        help="generate transactions as time-ordered account ledgers closing on accounts.balance")
+    parser.add_argument('--locale', default='en_US', help="Faker locale the value pools are drawn from")
+    parser.add_argument('--pool-cache',
+                        help="directory caching the value pools per seed and locale (built with Faker if missing)")
+    for table in TABLES:
+        parser.add_argument(f'--{table}', type=int, default=DEFAULT_COUNTS[table],
+                            help=f"number of {table} to generate when streaming")
+    parser.add_argument('--sql-format', choices=list(SQL_OUTPUTS), default='insert',
+                        help="INSERT statements, a PostgreSQL COPY script or one CSV file per table")
+    parser.add_argument('--batch-size', type=int, default=1, help="rows per INSERT statement")
+    parser.add_argument('--skip-excel', action='store_true', help="do not write the Excel workbook")
+    parser.add_argument('--columnar', choices=COLUMNAR_FORMATS,
+                        help="also write one Parquet or Arrow IPC file per table (requires pyarrow)")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
     
-    # Generate SQL inserts
-    generator.generate_sql_inserts()
-    
-    # Export to Excel
-    generator.export_to_excel()
+    telemetry = telemetry_from_args(args)
+    generator = BankingDataGenerator(seed=args.seed, reference_time=args.reference_time,
+                                     transaction_skew=args.transaction_skew, locale=args.locale,
+                                     pool_cache_dir=args.pool_cache, ledger=args.ledger, telemetry=telemetry)
+    if args.stream:
+        # Generate and write test data chunk by chunk
+        writers = [make_sql_writer(args.sql_format, SQL_OUTPUTS[args.sql_format], args.batch_size)]
+        if not args.skip_excel:
+            writers.append(ExcelSheetWriter("banking_test_data_now.xlsx"))
+        if args.columnar:
+            writers.append(ColumnarFileWriter(f"banking_test_data_{args.columnar}", args.columnar))
+        generator.stream_to(writers, {table: getattr(args, table) for table in TABLES}, args.chunk_size,
+                            args.workers)
+    else:
+        # Generate test data
+        generator.generate_all_data(vectorized=args.vectorized, compact=args.compact)
+        
+        # Generate SQL inserts
+        generator.generate_sql_inserts(SQL_OUTPUTS[args.sql_format], args.sql_format, args.batch_size)
+        
+        # Export to Excel
+        if not args.skip_excel:
+            generator.export_to_excel()
+        
+        # Export to Parquet / Arrow
+        if args.columnar:
+            generator.export_to_columnar(f"banking_test_data_{args.columnar}", args.columnar)
+    telemetry.close()
     
     print("\n" + "="*50)
     print("TEST DATA GENERATION COMPLETED!")
@@ -0,0 +1,199 @@
+import argparse
+import os
+import signal
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from load_banking_data import SqliteBulkWriter, bulk_load
+
+# load_banking_data puts data/ on sys.path
+from banking_test_data_generator import (  # noqa: E402
+    BankingDataGenerator, DEFAULT_CHUNK_SIZE, DEFAULT_COUNTS, DELTA_TABLES, SQL_OUTPUTS, TABLES,
+    chunk_length, delta_counts, make_sql_writer,
+)
+
+# Id prefixes of the tables that grow, used to drop rows written after the last saved state
+ID_PREFIXES = {"customers": "CUST", "accounts": "ACC", "transactions": "TXN"}
+
+def discard_unsaved_rows(conn, row_counts):
+    """Delete rows a previous run inserted after its last saved state, children first.
+
+    Ids are fixed-width, so everything past the saved counters sorts after
+    the last saved id. Returns the number of rows deleted per table.
+    """
+    deleted = {}
+    for table in reversed(DELTA_TABLES):
+        last_id = f"{ID_PREFIXES[table]}{row_counts[table]:010d}"
+        deleted[table] = conn.execute(f"DELETE FROM {table} WHERE id > ?", (last_id,)).rowcount
+    return deleted
+
+def discard_unsaved_output(output):
+    """Truncate a previous run's delta files back to their flushed sizes at its last saved state.
+
+    The resumed run generates the batches written after that state again,
+    so keeping them would duplicate their ids. CSV table files the previous
+    run only created after the state are removed. Returns the bytes dropped per file.
+    """
+    files = output["files"]
+    dropped = {}
+    if os.path.isdir(output["path"]):
+        for table in TABLES:
+            path = os.path.join(output["path"], f"{table}.csv")
+            if path not in files and os.path.exists(path):
+                dropped[path] = os.path.getsize(path)
+                os.remove(path)
+    for path, size in files.items():
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            dropped[path] = os.path.getsize(path) - size
+            os.truncate(path, size)
+    return dropped
+
+def run_incremental(generator, writer, state_file, batch_rows, step, rate=None, batches=None, duration=None,
+                    checkpoint_seconds=60.0, report_seconds=10.0, output=None):
+    """Feed incremental batches of batch_rows rows to writer, at most rate rows/sec if given.
+
+    Runs until batches batches or duration seconds (or Ctrl-C, which ends
+    the run after the current batch). The writer is flushed and the generator
+    state saved at the start, every checkpoint_seconds and when the run ends,
+    so the next run resumes with the following batch. With output (the delta
+    file or CSV directory) the flushed file sizes are saved with the state;
+    if the run dies, the last state and those sizes still match. Returns
+    rows, batches and seconds.
+    """
+    counts = delta_counts(batch_rows)
+    first_batch = generator.delta_batch
+
+    def checkpoint():
+        files = writer.flush()
+        generator.save_state(state_file, None if output is None else
+                             {"path": output, "batch": first_batch, "files": files})
+
+    checkpoint()
+    stop = []
+    previous_handler = signal.signal(signal.SIGINT, lambda *_: stop.append(True))
+    started = last_checkpoint = last_report = time.perf_counter()
+    rows = done = 0
+    try:
+        while not stop and (batches is None or done < batches) and \
+                (duration is None or time.perf_counter() - started < duration):
+            for table, chunk in generator.iter_delta_chunks(counts, step):
+                writer.write(table, chunk)
+                rows += chunk_length(chunk)
+            done += 1
+            now = time.perf_counter()
+            # Pace batches so the average rate stays at the target
+            if rate and started + rows / rate > now:
+                time.sleep(started + rows / rate - now)
+                now = time.perf_counter()
+            if now - last_checkpoint >= checkpoint_seconds:
+                checkpoint()
+                last_checkpoint = now
+            if now - last_report >= report_seconds:
+                print(f"{done} batches, {rows} rows in {now - started:.1f}s "
+                      f"({rows / (now - started):,.0f} rows/sec), data time {generator.now}")
+                last_report = now
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+    # Not saved when a batch failed: rows written since the last checkpoint are dropped on resume
+    checkpoint()
+    return {"rows": rows, "batches": done, "seconds": time.perf_counter() - started}
+
+def delta_output(sql_format, batch):
+    """Default file (or CSV directory) for a run's deltas, named after its first batch"""
+    return f"banking_delta_{batch:06d}" + ("" if sql_format == "csv" else ".sql")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Append new customers, accounts and transactions to a banking dataset at a target rate")
+    parser.add_argument("--state", default="banking_generator_state.npz",
+                        help="generator state file; created with a base dataset on the first run")
+    parser.add_argument("--database", help="SQLite database to insert into (default: write SQL/CSV files)")
+    parser.add_argument("--sql-format", choices=list(SQL_OUTPUTS), default="insert")
+    parser.add_argument("--output", help="delta file (or CSV directory) of this run, default banking_delta_<batch>")
+    parser.add_argument("--sql-batch-size", type=int, default=1, help="rows per INSERT statement")
+    parser.add_argument("--batch-rows", type=int, default=10000,
+                        help="rows per incremental batch, split over customers, accounts and transactions")
+    parser.add_argument("--rate", type=float, help="target rows/sec (default: as fast as possible)")
+    parser.add_argument("--step-seconds", type=float,
+                        help="data time each batch covers, at least 1 (default: batch-rows / rate, "
+                             "rounded up to 1, or 60)")
+    parser.add_argument("--batches", type=int, help="stop after this many batches")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--checkpoint-seconds", type=float, default=60.0, help="how often to save the state")
+    parser.add_argument("--report-seconds", type=float, default=10.0, help="how often to print progress")
+    # Base dataset, used only when the state file does not exist yet
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reference-time", type=datetime.fromisoformat,
+                        help="'now' of the base dataset (default: the current time)")
+    parser.add_argument("--transaction-skew", type=float, default=0.0)
+    parser.add_argument("--locale", default="en_US")
+    parser.add_argument("--pool-cache", help="value pool cache directory")
+    parser.add_argument("--schema", default="banking_schema_orig.sql")
+    parser.add_argument("--hot-indexes", action="store_true", help="build the hot-query indexes on the base load")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    for table in TABLES:
+        parser.add_argument(f"--{table}", type=int, default=DEFAULT_COUNTS[table],
+                            help=f"number of {table} in the base dataset")
+    args = parser.parse_args()
+    # Timestamps are whole seconds, so a batch must cover at least one
+    step = args.step_seconds
+    if step is None:
+        step = max(args.batch_rows / args.rate, 1.0) if args.rate else 60.0
+    elif step < 1:
+        parser.error("--step-seconds must be at least 1")
+
+    resuming = os.path.exists(args.state)
+    if resuming:
+        generator = BankingDataGenerator.load_state(args.state, args.pool_cache)
+        print(f"Resuming at batch {generator.delta_batch}, data time {generator.now}: {generator.row_counts}")
+    else:
+        generator = BankingDataGenerator(seed=args.seed, reference_time=args.reference_time,
+                                         transaction_skew=args.transaction_skew, locale=args.locale,
+                                         pool_cache_dir=args.pool_cache)
+    counts = {table: getattr(args, table) for table in TABLES}
+
+    if args.database:
+        if resuming:
+            conn = sqlite3.connect(args.database, isolation_level=None)
+            deleted = discard_unsaved_rows(conn, generator.row_counts)
+            if any(deleted.values()):
+                print(f"Deleted rows inserted after the saved state: {deleted}")
+        else:
+            conn, _ = bulk_load(args.database, args.schema, generator, counts, args.chunk_size, args.workers,
+                                args.hot_indexes)
+            generator.save_state(args.state)
+        writer = SqliteBulkWriter(conn)
+    else:
+        output = args.output or delta_output(args.sql_format, generator.delta_batch)
+        previous = generator.saved_output
+        if previous:
+            same_output = os.path.abspath(previous["path"]) == os.path.abspath(output)
+            if same_output and generator.delta_batch > previous["batch"]:
+                # Rewriting the file would lose the batches it holds from before the saved state
+                parser.error(f"{output} holds the previous run's batches from {previous['batch']}; "
+                             "choose another --output")
+            dropped = discard_unsaved_output(previous)
+            if dropped:
+                print(f"Truncated deltas written after the saved state: {dropped}")
+        writer = make_sql_writer(args.sql_format, output, args.sql_batch_size)
+        if not resuming:
+            # The first run's file starts with the base dataset
+            for table, chunk in generator.iter_table_chunks(counts, args.chunk_size, args.workers):
+                writer.write(table, chunk)
+        print(f"Writing deltas to {output}")
+
+    # Build the value pools now rather than inside the first timed batch
+    generator.get_value_pools()
+    try:
+        result = run_incremental(generator, writer, args.state, args.batch_rows, timedelta(seconds=step), args.rate,
+                                 args.batches, args.duration, args.checkpoint_seconds, args.report_seconds,
+                                 None if args.database else output)
+    finally:
+        writer.close()
+        if args.database:
+            conn.close()
+    print(f"\n{result['batches']} batches, {result['rows']} rows in {result['seconds']:.1f}s "
+          f"({result['rows'] / result['seconds']:,.0f} rows/sec); next batch {generator.delta_batch}, "
+          f"data time {generator.now}")
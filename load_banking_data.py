@@ -1,32 +1,339 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
 import sqlite3
+import sys
+import time
+from datetime import datetime
 
-def load_schema_and_data(schema_file, data_file):
+import compile_banking_schema
+from compile_banking_schema import compile_schema
+
+# The generator lives next to its data files
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+from banking_test_data_generator import (  # noqa: E402
+    BankingDataGenerator, DEFAULT_CHUNK_SIZE, DEFAULT_COUNTS, TABLE_COLUMNS, TABLES, Telemetry,
+    add_telemetry_arguments, chunk_rows, telemetry_from_args,
+)
+
+# PRAGMAs for the bulk load: rollback journal in memory (so a failed chunk can still roll back),
+# no fsync, and a 256 MB page cache
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -262144,
+    "temp_store": "MEMORY",
+}
+
+# Cached fixture databases: where they live, how much disk they may use and the fixed
+# "now" they are generated with (a moving reference time would never hit the cache)
+DEFAULT_FIXTURE_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "banking_fixtures")
+DEFAULT_FIXTURE_CACHE_BYTES = 1 << 30
+FIXTURE_REFERENCE_TIME = datetime(2025, 1, 1)
+
+def load_schema_and_data(schema_file, data_file, telemetry=None):
+    if telemetry is None:
+        telemetry = Telemetry()
     # Create an in-memory SQLite database
     conn = sqlite3.connect(":memory:")
     cursor = conn.cursor()
 
-    # Load and execute schema
-    with open(schema_file, 'r') as schema:
-        schema_sql = schema.read()
-        cursor.executescript(schema_sql)
+    try:
+        # Load and execute schema (compiled from MySQL syntax to SQLite): tables first,
+        # unique indexes and triggers once the data is in, as bulk_load does
+        with telemetry.stage("schema"), open(schema_file, 'r') as schema:
+            compiled = compile_schema(schema.read(), "sqlite")
+            cursor.executescript("".join(f"{statement};\n" for statement in compiled.tables))
+
+        # Load and execute test data
+        with telemetry.stage("data"), open(data_file, 'r') as data:
+            data_sql = data.read()
+            cursor.executescript(data_sql)
+
+        with telemetry.stage("deferred", statements=len(compiled.deferred)):
+            cursor.executescript("".join(f"{statement};\n" for statement in compiled.deferred))
+        # CHECKs only became triggers after the load, so validate the rows already in
+        with telemetry.stage("validations"):
+            for name, violations in (cursor.execute(query).fetchone() for query in compiled.validations):
+                if violations:
+                    raise sqlite3.IntegrityError(f"CHECK constraint failed: {name} ({violations} rows)")
+
+        # Verify data loading
+        with telemetry.stage("verify", "branches"):
+            cursor.execute("SELECT * FROM branches;")
+            rows = cursor.fetchall()
+        for row in rows:
+            print(row)
+    finally:
+        # Close connection
+        conn.close()
+
+class SqliteBulkWriter:
+    """Insert generator chunks into SQLite with executemany, one transaction per chunk"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = {}
+        self.seconds = {}
+
+    def write(self, table, chunk):
+        started = time.perf_counter()
+        columns = TABLE_COLUMNS[table]
+        placeholders = ", ".join("?" * len(columns))
+        rows = chunk_rows(table, chunk)
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        self.rows[table] = self.rows.get(table, 0) + len(rows)
+        self.seconds[table] = self.seconds.get(table, 0.0) + time.perf_counter() - started
+
+    def flush(self):
+        # Every chunk is committed as it is written; there are no files to report
+        return None
+
+    def close(self):
+        # The connection belongs to the caller
+        pass
+
+def bulk_load(database=":memory:", schema_file="banking_schema_orig.sql", generator=None,
+              counts=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, hot_indexes=False):
+    """Stream generator rows straight into SQLite and return (connection, per-table stats).
+
+    The schema is compiled for SQLite: tables are created first, rows are
+    inserted with executemany in large transactions under bulk-load PRAGMAs,
+    and the deferred phase (unique and idx_* indexes, plus the covering and
+    partial hot-query indexes if hot_indexes, and triggers) runs once at the end.
+    Stats map each table to rows, seconds and rows_per_sec, and "indexes"
+    (the whole deferred phase) to its seconds only.
+    """
+    if generator is None:
+        generator = BankingDataGenerator()
+    conn = sqlite3.connect(database, isolation_level=None)
+    try:
+        for pragma, value in BULK_LOAD_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+
+        with open(schema_file, 'r') as schema:
+            compiled = compile_schema(schema.read(), "sqlite", hot_indexes)
+        for statement in compiled.tables:
+            conn.execute(statement)
+
+        writer = SqliteBulkWriter(conn)
+        generator.stream_to([writer], counts, chunk_size, workers)
+
+        # Build indexes once, after all rows are in
+        stage = generator.telemetry.stage
+        started = time.perf_counter()
+        with stage("deferred", statements=len(compiled.deferred)):
+            for statement in compiled.deferred:
+                conn.execute(statement)
+        # CHECKs only became triggers after the load, so validate the rows already in
+        with stage("validations"):
+            for name, violations in (conn.execute(query).fetchone() for query in compiled.validations):
+                if violations:
+                    raise sqlite3.IntegrityError(f"CHECK constraint failed: {name} ({violations} rows)")
+        with stage("analyze"):
+            conn.execute("ANALYZE")
+        index_seconds = time.perf_counter() - started
+    except BaseException:
+        conn.close()
+        raise
+
+    # Back to durable settings for whoever uses the database next
+    conn.execute("PRAGMA synchronous = FULL")
+    if database != ":memory:":
+        conn.execute("PRAGMA journal_mode = DELETE")
+
+    stats = {}
+    for table in TABLES:
+        rows, seconds = writer.rows.get(table, 0), writer.seconds.get(table, 0.0)
+        stats[table] = {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else 0.0}
+    stats["indexes"] = {"seconds": index_seconds}
+    return conn, stats
+
+def fixture_key(schema_file, seed=42, counts=None, reference_time=FIXTURE_REFERENCE_TIME, transaction_skew=0.0,
+                locale="en_US", chunk_size=DEFAULT_CHUNK_SIZE, hot_indexes=False):
+    """SHA-256 of everything a bulk-loaded database depends on.
+
+    That is the generation parameters (chunk_size sets the shard boundaries,
+    the worker count does not matter), the schema file contents and the
+    source of the generator, the schema compiler and this loader, so editing
+    any of them invalidates old fixtures.
+    """
+    params = {
+        "seed": seed,
+        "counts": {**DEFAULT_COUNTS, **(counts or {})},
+        "reference_time": reference_time.isoformat(),
+        "transaction_skew": transaction_skew,
+        "locale": locale,
+        "chunk_size": chunk_size,
+        "hot_indexes": hot_indexes,
+    }
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8"))
+    sources = [inspect.getsourcefile(BankingDataGenerator), inspect.getsourcefile(compile_banking_schema),
+               os.path.abspath(__file__)]
+    for path in [schema_file] + sources:
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+class FixtureCache:
+    """Directory of ready-to-use SQLite databases named by fixture_key, evicted least recently used first.
+
+    A hit costs a file copy or an sqlite3 backup instead of generating and
+    loading the data again. Files are written under a temporary name and
+    renamed into place, so concurrent test processes can share one cache.
+    """
+
+    def __init__(self, directory=DEFAULT_FIXTURE_CACHE, max_bytes=DEFAULT_FIXTURE_CACHE_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.db")
+
+    def get(self, key):
+        """Path of the cached database for key (marking it recently used), or None on a miss"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, build):
+        """Run build(path) to create the database for key, store it and evict down to the size cap"""
+        partial = f"{self.path(key)}.{os.getpid()}.tmp"
+        try:
+            build(partial)
+            os.replace(partial, self.path(key))
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        self.evict(keep=key)
+        return self.path(key)
+
+    def entries(self):
+        """(last used, bytes, path) for every cached database, least recently used first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".db"):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self, keep=None):
+        """Delete least recently used databases until the cache fits in max_bytes (never keep's)"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == self.path(keep):
+                continue
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+    def restore(self, key, database=":memory:"):
+        """Open a private copy of a cached database: sqlite3 backup for :memory:, a file copy otherwise"""
+        path = self.get(key)
+        if path is None:
+            raise KeyError(key)
+        if database != ":memory:":
+            shutil.copyfile(path, database)
+            return sqlite3.connect(database)
+        conn = sqlite3.connect(database)
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            source.backup(conn)
+        finally:
+            source.close()
+        return conn
+
+def cached_database(database=":memory:", schema_file="banking_schema_orig.sql", seed=42, counts=None,
+                    reference_time=FIXTURE_REFERENCE_TIME, transaction_skew=0.0, locale="en_US",
+                    chunk_size=DEFAULT_CHUNK_SIZE, workers=1, hot_indexes=False, cache=None):
+    """Connection to a fresh copy of the bulk-loaded banking database for these parameters.
 
-    # Load and execute test data
-    with open(data_file, 'r') as data:
-        data_sql = data.read()
-        cursor.executescript(data_sql)
+    The first call generates and loads the data with bulk_load and stores
+    the result in the fixture cache; later calls only restore the snapshot.
+    """
+    if cache is None:
+        cache = FixtureCache()
+    key = fixture_key(schema_file, seed, counts, reference_time, transaction_skew, locale, chunk_size, hot_indexes)
+    if cache.get(key) is None:
+        def build(path):
+            generator = BankingDataGenerator(seed=seed, reference_time=reference_time,
+                                             transaction_skew=transaction_skew, locale=locale)
+            conn, stats = bulk_load(path, schema_file, generator, counts, chunk_size, workers, hot_indexes)
+            conn.close()
+        cache.put(key, build)
+    return cache.restore(key, database)
 
-    # Verify data loading
-    cursor.execute("SELECT * FROM branches;")
-    rows = cursor.fetchall()
-    for row in rows:
-        print(row)
+def print_load_stats(stats):
+    """Print the rows/sec achieved for each table"""
+    print(f"\n{'Table':<14}{'Rows':>12}{'Seconds':>10}{'Rows/sec':>14}")
+    for table, stat in stats.items():
+        if "rows" in stat:
+            print(f"{table:<14}{stat['rows']:>12}{stat['seconds']:>10.3f}{stat['rows_per_sec']:>14,.0f}")
+        else:
+            print(f"{table:<14}{'-':>12}{stat['seconds']:>10.3f}{'-':>14}")
 
-    # Close connection
-    conn.close()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load banking test data into SQLite")
+    parser.add_argument("--bulk", action="store_true",
+                        help="generate rows and bulk insert them directly instead of running the SQL file")
+    parser.add_argument("--database", default=":memory:", help="SQLite database file for --bulk")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per insert batch")
+    parser.add_argument("--workers", type=int, default=1, help="generator processes for --bulk")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for --bulk")
+    parser.add_argument("--hot-indexes", action="store_true",
+                        help="also build covering and partial indexes for frequent queries (with --bulk)")
+    parser.add_argument("--fixture-cache", nargs="?", const=DEFAULT_FIXTURE_CACHE,
+                        help="reuse a cached database for the same parameters and schema (with --bulk)")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_FIXTURE_CACHE_BYTES >> 20,
+                        help="size cap of the fixture cache; least recently used databases are evicted")
+    for table in TABLES:
+        parser.add_argument(f"--{table}", type=int, help=f"number of {table} to generate for --bulk")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+    telemetry = telemetry_from_args(args)
 
-# File paths
-schema_file = "banking_schema_orig.sql"
-data_file = "data/banking_test_data_now.sql"
+    # File paths
+    schema_file = "banking_schema_orig.sql"
+    data_file = "data/banking_test_data_now.sql"
 
-# Load schema and data
-load_schema_and_data(schema_file, data_file)
\ No newline at end of file
+    if args.bulk and args.fixture_cache:
+        counts = {table: getattr(args, table) for table in TABLES if getattr(args, table) is not None}
+        started = time.perf_counter()
+        cache = FixtureCache(args.fixture_cache, args.cache_size_mb << 20)
+        with telemetry.stage("fixture"):
+            conn = cached_database(args.database, schema_file, args.seed, counts, chunk_size=args.chunk_size,
+                                   workers=args.workers, hot_indexes=args.hot_indexes, cache=cache)
+        rows = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+        print(f"Fixture database ready in {time.perf_counter() - started:.3f}s: {rows}")
+        conn.close()
+    elif args.bulk:
+        counts = {table: getattr(args, table) for table in TABLES if getattr(args, table) is not None}
+        generator = BankingDataGenerator(seed=args.seed, telemetry=telemetry)
+        conn, stats = bulk_load(args.database, schema_file, generator, counts, args.chunk_size, args.workers,
+                                args.hot_indexes)
+        print_load_stats(stats)
+        conn.close()
+    else:
+        # Load schema and data
+        load_schema_and_data(schema_file, data_file, telemetry)
+    telemetry.close()
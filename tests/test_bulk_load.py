@@ -0,0 +1,37 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from load_banking_data import BULK_LOAD_PRAGMAS, SqliteBulkWriter, load_schema_and_data  # noqa: E402
+
+SCHEMA_FILE = os.path.join(ROOT, "banking_schema_orig.sql")
+
+def branch(branch_id):
+    return {"id": branch_id, "name": "Main Branch 1", "address": "1 Main St", "city": "Austin", "state": "TX",
+            "zip_code": "73301", "manager_id": None, "created_at": None, "updated_at": None}
+
+def test_failed_chunk_rolls_back_under_bulk_load_pragmas():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    for pragma, value in BULK_LOAD_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    conn.execute("CREATE TABLE branches (id TEXT PRIMARY KEY, name TEXT, address TEXT, city TEXT, state TEXT, "
+                 "zip_code TEXT, manager_id TEXT, created_at TEXT, updated_at TEXT)")
+    writer = SqliteBulkWriter(conn)
+    writer.write("branches", [branch("BR1")])
+    with pytest.raises(sqlite3.IntegrityError):
+        # The duplicate fails after BR2 and BR3 were inserted in the same chunk
+        writer.write("branches", [branch("BR2"), branch("BR3"), branch("BR1")])
+    assert not conn.in_transaction
+    assert [row[0] for row in conn.execute("SELECT id FROM branches ORDER BY id")] == ["BR1"]
+
+def test_sql_load_validates_checks_after_the_data(tmp_path):
+    data_file = tmp_path / "data.sql"
+    data_file.write_text("INSERT INTO accounts (id, customer_id, account_number, type, balance, opened_at, status) "
+                         "VALUES ('ACC1', 'CUST1', '1000000001', 'brokerage', 0, '2024-01-01', 'active');\n")
+    # CHECK triggers are created after the data, so the bad row is caught by the validation queries
+    with pytest.raises(sqlite3.IntegrityError, match="chk_account_type"):
+        load_schema_and_data(SCHEMA_FILE, str(data_file))
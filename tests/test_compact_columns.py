@@ -0,0 +1,34 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+from banking_test_data_generator import BankingDataGenerator, chunk_rows, records_to_columns  # noqa: E402
+
+@pytest.fixture(scope="module")
+def customers(tmp_path_factory):
+    gen = BankingDataGenerator(seed=42, reference_time=datetime(2025, 1, 1),
+                               pool_cache_dir=str(tmp_path_factory.mktemp("pools")))
+    gen.generate_branches(3)
+    gen.generate_employees(20)
+    gen.generate_customers(50)
+    return gen.customers
+
+def test_whole_second_datetimes_compact_to_seconds(customers):
+    columns = records_to_columns("customers", customers)
+    assert columns["created_at"].dtype == np.dtype("datetime64[s]")
+    # Compact columns render exactly like the row dicts they came from
+    assert chunk_rows("customers", columns) == chunk_rows("customers", customers)
+
+def test_sub_second_datetimes_render_as_text(customers):
+    rows = [dict(customer) for customer in customers]
+    rows[0]["created_at"] = rows[0]["created_at"].replace(microsecond=250000)
+    columns = records_to_columns("customers", rows)
+    assert columns["created_at"].dtype == np.dtype("datetime64[us]")
+    rendered = chunk_rows("customers", columns)
+    assert rendered == chunk_rows("customers", rows)
+    # Text, not datetime objects (sqlite3's datetime adapter is deprecated)
+    assert rendered[0][9] == str(rows[0]["created_at"])
@@ -0,0 +1,68 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "data")]
+from banking_test_data_generator import (  # noqa: E402
+    BankingDataGenerator, chunk_literals, delta_counts, make_sql_writer,
+)
+from incremental_banking_data import discard_unsaved_output  # noqa: E402
+
+COUNTS = {"branches": 5, "employees": 50, "customers": 200, "accounts": 300, "transactions": 1000}
+
+def base_generator(pool_cache):
+    generator = BankingDataGenerator(seed=42, reference_time=datetime(2025, 1, 1), pool_cache_dir=pool_cache)
+    for _ in generator.iter_table_chunks(COUNTS):
+        pass
+    return generator
+
+def batch_literals(generator):
+    return [(table, chunk_literals(table, chunk))
+            for table, chunk in generator.iter_delta_chunks(delta_counts(1000), timedelta(minutes=5))]
+
+def test_abandoned_batch_leaves_state_untouched(tmp_path):
+    generator = base_generator(str(tmp_path))
+    before = (generator.now, generator.reference_time, dict(generator.row_counts), generator.delta_batch)
+    batch = generator.iter_delta_chunks(delta_counts(1000), timedelta(minutes=5))
+    next(batch)  # A writer failing on the first chunk abandons the rest of the batch
+    assert (generator.now, generator.reference_time, generator.row_counts, generator.delta_batch) == before
+    # Replaying the batch yields what an uninterrupted generator yields
+    assert batch_literals(generator) == batch_literals(base_generator(str(tmp_path)))
+    assert generator.now == before[0] + timedelta(minutes=5)
+    assert generator.reference_time == np.datetime64(generator.now, "s")
+
+def test_resume_truncates_deltas_written_after_the_saved_state(tmp_path):
+    generator = base_generator(str(tmp_path))
+    for mode, output in (("insert", str(tmp_path / "delta.sql")), ("csv", str(tmp_path / "delta"))):
+        writer = make_sql_writer(mode, output)
+        for table, chunk in generator.iter_delta_chunks(delta_counts(300), timedelta(minutes=1)):
+            writer.write(table, chunk)
+        saved = {"path": output, "batch": 0, "files": writer.flush()}
+        contents = {path: open(path).read() for path in saved["files"]}
+        # The run goes on past the saved state and dies
+        for table, chunk in generator.iter_delta_chunks(delta_counts(300), timedelta(minutes=1)):
+            writer.write(table, chunk)
+        writer.close()
+        assert discard_unsaved_output(saved)
+        assert {path: open(path).read() for path in saved["files"]} == contents
+
+def test_fractional_steps_carry_over_and_sub_second_steps_are_rejected(tmp_path):
+    generator = base_generator(str(tmp_path))
+    start = generator.reference_time
+    with pytest.raises(ValueError):
+        next(generator.iter_delta_chunks(delta_counts(300), timedelta(milliseconds=500)))
+    windows = []
+    for _ in range(4):
+        since = generator.reference_time
+        dates = np.concatenate([chunk["transaction_date"] for table, chunk
+                                in generator.iter_delta_chunks(delta_counts(300), timedelta(seconds=1.5))
+                                if table == "transactions"])
+        windows.append(generator.reference_time - since)
+        assert since <= dates.min() and dates.max() <= generator.reference_time
+    # Every batch covers at least a second, and the half seconds add up
+    assert min(windows) >= np.timedelta64(1, "s")
+    assert generator.reference_time - start == np.timedelta64(6, "s")
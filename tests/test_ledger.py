@@ -0,0 +1,59 @@
+import itertools
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+from banking_test_data_generator import (  # noqa: E402
+    ACCOUNT_TYPES, LEDGER_FLOORS, TABLE_COLUMNS, BankingDataGenerator, chunk_rows, records_to_columns,
+)
+
+# About 7 transactions per account
+COUNTS = {"branches": 5, "employees": 40, "customers": 200, "accounts": 300, "transactions": 2000}
+
+@pytest.fixture(scope="module")
+def pool_cache(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("pools"))
+
+def generator(pool_cache):
+    return BankingDataGenerator(seed=42, reference_time=datetime(2025, 1, 1), pool_cache_dir=pool_cache,
+                                ledger=True)
+
+def records(table, chunks):
+    return [dict(zip(TABLE_COLUMNS[table], row)) for chunk in chunks for row in chunk_rows(table, chunk)]
+
+def assert_ledgers_hold(accounts, transactions):
+    floors = {account["id"]: round(LEDGER_FLOORS[ACCOUNT_TYPES.index(account["type"])] * 100)
+              for account in accounts}
+    histories = [list(history) for _, history in itertools.groupby(transactions, key=lambda t: t["account_id"])]
+    # One contiguous history per account
+    assert len(histories) == len({history[0]["account_id"] for history in histories}) == len(accounts)
+    for history in histories:
+        dates = [transaction["transaction_date"] for transaction in history]
+        assert dates == sorted(dates)
+        balance = 0
+        for transaction in history:
+            if transaction["status"] == "completed":
+                balance += round(transaction["amount"] * 100)
+                assert balance >= floors[transaction["account_id"]], transaction
+
+def test_vectorized_ledgers(pool_cache):
+    gen = generator(pool_cache)
+    gen.generate_all_data(vectorized=True, counts=COUNTS)
+    assert len(gen.reconcile_ledger()) == 0
+    assert_ledgers_hold(records("accounts", [gen.table_data("accounts")]),
+                        records("transactions", [gen.table_data("transactions")]))
+
+def test_streamed_ledgers_span_chunks(pool_cache):
+    gen = generator(pool_cache)
+    chunks = {"accounts": [], "transactions": []}
+    # Chunks shorter than one history split most ledgers across shards
+    for table, chunk in gen.iter_table_chunks(COUNTS, chunk_size=5):
+        chunks.get(table, []).append(chunk)
+    transactions = records("transactions", chunks["transactions"])
+    # Streamed transactions are not retained: hand them back for reconciliation
+    gen.columns["transactions"] = records_to_columns("transactions", transactions)
+    assert len(gen.reconcile_ledger()) == 0
+    assert_ledgers_hold(records("accounts", chunks["accounts"]), transactions)
@@ -0,0 +1,48 @@
+import hashlib
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+from banking_test_data_generator import BankingDataGenerator, TABLE_COLUMNS, chunk_literals, chunk_rows  # noqa: E402
+
+REFERENCE_TIME = datetime(2025, 1, 1)
+COUNTS = {"branches": 10, "employees": 50, "customers": 600, "accounts": 900, "transactions": 3000}
+
+@pytest.fixture(scope="module")
+def pool_cache(tmp_path_factory):
+    # Build the Faker value pools once for every generator in this module
+    return str(tmp_path_factory.mktemp("pools"))
+
+def generator(pool_cache, seed=42):
+    return BankingDataGenerator(seed=seed, reference_time=REFERENCE_TIME, pool_cache_dir=pool_cache)
+
+def output_digest(gen, chunk_size, workers):
+    """md5 of every table chunk rendered as SQL literals"""
+    digest = hashlib.md5()
+    for table, chunk in gen.iter_table_chunks(COUNTS, chunk_size, workers):
+        for row in chunk_literals(table, chunk):
+            digest.update(f"{table}({', '.join(row)})\n".encode())
+    return digest.hexdigest()
+
+def test_customers_vary_within_a_shard(pool_cache):
+    gen = generator(pool_cache)
+    shards = [chunk for table, chunk in gen.iter_table_chunks({**COUNTS, "customers": 500}, chunk_size=1000)
+              if table == "customers"]
+    assert len(shards) == 1, "all customers should come from a single shard"
+    customers = [dict(zip(TABLE_COLUMNS["customers"], row)) for row in chunk_rows("customers", shards[0])]
+    for column in ("branch_id", "gender", "last_name", "date_of_birth"):
+        assert len({customer[column] for customer in customers}) > 1, column
+    # About 5% of customers have no phone, the rest do
+    missing = sum(customer["phone"] is None for customer in customers)
+    assert 0 < missing < len(customers) // 2
+
+def test_output_does_not_depend_on_workers(pool_cache):
+    single = output_digest(generator(pool_cache), chunk_size=250, workers=1)
+    pooled = output_digest(generator(pool_cache), chunk_size=250, workers=3)
+    assert single == pooled
+
+def test_output_depends_on_seed(pool_cache):
+    assert output_digest(generator(pool_cache), 250, 1) != output_digest(generator(pool_cache, seed=7), 250, 1)
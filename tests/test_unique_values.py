@@ -0,0 +1,21 @@
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+from banking_test_data_generator import BankingDataGenerator  # noqa: E402
+
+def test_email_counter_cannot_run_into_user_name_digits(tmp_path):
+    # Seed 4 pools both "danielle" and "danielle62": with a bare counter suffix, customer 7
+    # ("danielle62" + "7") and customer 627 ("danielle" + "627") could share an email
+    generator = BankingDataGenerator(seed=4, reference_time=datetime(2025, 1, 1), pool_cache_dir=str(tmp_path))
+    user_names = generator.get_value_pools().lists["user_name"]
+    assert "danielle" in user_names and "danielle62" in user_names
+    assert not any("+" in name for name in user_names)
+    generator.generate_branches(5)
+    generator.generate_employees(500)
+    generator.generate_customers(2000)
+    for table in ("employees", "customers"):
+        for i, row in enumerate(getattr(generator, table)):
+            local_part = row["email"].split("@")[0]
+            assert local_part.count("+") == 1 and local_part.endswith(f"+{i + 1}"), row["email"]
@@ -0,0 +1,474 @@
+import argparse
+import json
+import multiprocessing
+import re
+import sys
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from compile_banking_schema import parse_schema
+from load_banking_data import FIXTURE_REFERENCE_TIME
+
+# load_banking_data puts data/ on sys.path
+from banking_test_data_generator import (  # noqa: E402
+    BankingDataGenerator, DEFAULT_CHUNK_SIZE, DEFAULT_COUNTS, TABLES, DictionaryColumn, records_to_columns,
+)
+
+# A column that must not be earlier than another one: a column of the same table or, with
+# via (a foreign key column), a column of the referenced row. Dates compare by day.
+TemporalRule = namedtuple("TemporalRule", "table column earlier via")
+
+TEMPORAL_RULES = [
+    TemporalRule("branches", "updated_at", "created_at", None),
+    TemporalRule("employees", "created_at", "hire_date", None),
+    TemporalRule("employees", "updated_at", "created_at", None),
+    TemporalRule("customers", "created_at", "date_of_birth", None),
+    TemporalRule("customers", "updated_at", "created_at", None),
+    TemporalRule("accounts", "opened_at", "created_at", "customer_id"),
+    TemporalRule("accounts", "created_at", "opened_at", None),
+    TemporalRule("accounts", "updated_at", "created_at", None),
+    TemporalRule("transactions", "transaction_date", "opened_at", "account_id"),
+    TemporalRule("transactions", "created_at", "transaction_date", None),
+    TemporalRule("transactions", "updated_at", "created_at", None),
+]
+
+# Columns the schema leaves nullable that generated data is still expected to fill
+EXPECTED_COLUMNS = {"branches": ["manager_id"]}
+
+# What the validator checks on one table, derived from the schema
+TableConstraints = namedtuple("TableConstraints", "not_null expected unique lengths enums foreign_keys temporal")
+
+# Rows of a table breaking one constraint: how many, and a few samples ("<row id>: <value>")
+Violation = namedtuple("Violation", "kind table column detail count samples")
+
+# Order violations are reported in within a table
+KINDS = ["not_null", "missing", "unique", "length", "check", "foreign_key", "temporal"]
+
+_ENUM = re.compile(r"(\w+)\s+IN\s*\((.*)\)", re.IGNORECASE)
+_LENGTH = re.compile(r"(?:VAR)?CHAR\((\d+)\)")
+
+_FNV_OFFSET = np.uint64(14695981039346656037)
+_FNV_PRIME = np.uint64(1099511628211)
+
+def table_constraints(schema):
+    """TableConstraints of every table of a parsed schema (plus TEMPORAL_RULES and EXPECTED_COLUMNS)"""
+    constraints = {}
+    for table in schema.tables:
+        enums = {}
+        for check in schema.checks:
+            enum = _ENUM.fullmatch(check.expression)
+            if check.table == table.name and enum:
+                column, values = enum.groups()
+                enums[column] = (check.name, frozenset(re.findall(r"'((?:[^']|'')*)'", values)))
+        constraints[table.name] = TableConstraints(
+            not_null=[column.name for column in table.columns if column.not_null or column.primary_key],
+            expected=EXPECTED_COLUMNS.get(table.name, []),
+            unique=[column.name for column in table.columns if column.unique or column.primary_key],
+            lengths={column.name: int(_LENGTH.match(column.type).group(1))
+                     for column in table.columns if _LENGTH.match(column.type)},
+            enums=enums,
+            foreign_keys=[foreign_key for foreign_key in schema.foreign_keys if foreign_key.table == table.name],
+            temporal=[rule for rule in TEMPORAL_RULES if rule.table == table.name],
+        )
+    return constraints
+
+def _retained_columns(constraints):
+    """Columns of each table that checks of other tables look up: referenced keys and temporal parents"""
+    retained = {}
+    for table_constraints in constraints.values():
+        references = {foreign_key.column: foreign_key for foreign_key in table_constraints.foreign_keys}
+        for foreign_key in table_constraints.foreign_keys:
+            retained.setdefault(foreign_key.ref_table, {foreign_key.ref_column})
+        for rule in table_constraints.temporal:
+            if rule.via:
+                retained[references[rule.via].ref_table].add(rule.earlier)
+    return retained
+
+def null_mask(values):
+    """Rows holding NULL in a column array (b'' ids, None, NaN or NaT)"""
+    if isinstance(values, DictionaryColumn):
+        return np.equal(values.values, None)[values.codes]
+    if values.dtype.kind == "S":
+        return values == b""
+    if values.dtype.kind == "f":
+        return np.isnan(values)
+    if values.dtype.kind == "M":
+        return np.isnat(values)
+    return np.equal(values, None)
+
+def _encoded(values):
+    """Text values as a fixed-width UTF-8 byte array"""
+    if values.dtype.kind == "S":
+        return values
+    return np.array([value.encode("utf-8") for value in values.tolist()], dtype="S")
+
+def key_hashes(values):
+    """64-bit FNV-1a hash of every (non-NULL) value of a text or id column.
+
+    Hashing fixed-width bytes column by column keeps the whole computation
+    vectorized. Zero padding bytes are skipped, so the same value hashes the
+    same in arrays of different widths.
+    """
+    if isinstance(values, DictionaryColumn):
+        return key_hashes(values.values)[values.codes]
+    data = _encoded(values)
+    hashes = np.full(len(data), _FNV_OFFSET)
+    if not len(data) or not data.dtype.itemsize:
+        return hashes
+    buf = np.ascontiguousarray(data.view(np.uint8).reshape(len(data), -1).T)
+    empty = buf[0] == 0
+    if empty.any():
+        # Leave empty values (NULL ids) at the offset basis and hash the rest on the fast path below
+        hashes[~empty] = key_hashes(data[~empty])
+        return hashes
+    # One contiguous row per byte position, mixed into every hash at once
+    for byte in buf:
+        if byte.all():
+            hashes ^= byte
+            hashes *= _FNV_PRIME
+        else:
+            present = byte != 0
+            np.bitwise_xor(hashes, byte, out=hashes, where=present)
+            np.multiply(hashes, _FNV_PRIME, out=hashes, where=present)
+    return hashes
+
+class KeyIndex:
+    """A table's key column as sorted hashes, joined against with searchsorted.
+
+    Also carries the table's other retained columns, so a child row can read
+    its parent row's values (e.g. accounts.opened_at for a transaction).
+    Distinct keys sharing a 64-bit hash are astronomically unlikely and are
+    not told apart.
+    """
+
+    def __init__(self, keys, columns):
+        hashes = key_hashes(keys)
+        self.order = np.argsort(hashes)
+        self.hashes = hashes[self.order]
+        self.columns = columns
+
+    def rows(self, values):
+        """Row positions of the given keys, -1 where a key is not in the table"""
+        hashes = key_hashes(values)
+        if not len(self.hashes):
+            return np.full(len(hashes), -1, dtype=np.int64)
+        # Searching in sorted order walks the table's hashes once instead of jumping around
+        order = np.argsort(hashes)
+        found = np.empty(len(hashes), dtype=np.int64)
+        found[order] = np.searchsorted(self.hashes, hashes[order])
+        found = found.clip(max=len(self.hashes) - 1)
+        return np.where(self.hashes[found] == hashes, self.order[found], -1)
+
+def _display(value):
+    """A sample value as text (ids unquoted, timestamps to the second, NULL for NULL sentinels)"""
+    if value is None or value == b"" or (isinstance(value, float) and value != value):
+        return "NULL"
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, np.datetime64):
+        return "NULL" if np.isnat(value) else str(value.astype("datetime64[s]") if value.dtype != "M8[D]" else value)
+    return repr(value)
+
+def _samples(columns, rows, column, limit, earlier=None):
+    """'<id>: <value>' strings for the first rows of a violation ('<value> < <earlier>' for temporal ones)"""
+    rows = rows[:limit]
+    ids = columns["id"][rows] if "id" in columns else rows
+    values = columns[column]
+    values = values.values[values.codes[rows]] if isinstance(values, DictionaryColumn) else values[rows]
+    samples = [f"{_display(row_id)}: {_display(value)}" for row_id, value in zip(ids.tolist(), values)]
+    if earlier is not None:
+        samples = [f"{sample} < {_display(value)}" for sample, value in zip(samples, earlier[rows])]
+    return samples
+
+def _text_lengths(values):
+    """Character length of every value of a text column (0 for NULL)"""
+    if isinstance(values, DictionaryColumn):
+        return _text_lengths(values.values)[values.codes]
+    if values.dtype.kind == "S":
+        return np.char.str_len(values)
+    return np.fromiter((len(value) if value is not None else 0 for value in values.tolist()), np.int64, len(values))
+
+def _enum_mask(values, allowed):
+    """Rows whose (non-NULL) value is outside allowed"""
+    if not isinstance(values, DictionaryColumn):
+        values = DictionaryColumn.encode(values.tolist())
+    outside = np.array([value is not None and value not in allowed for value in values.values.tolist()], dtype=bool)
+    return outside[values.codes] if len(outside) else np.zeros(len(values), dtype=bool)
+
+def _compared_times(later, earlier):
+    """Two datetime64 columns at a common resolution: days if either is a date"""
+    if "D" in (np.datetime_data(later.dtype)[0], np.datetime_data(earlier.dtype)[0]):
+        return later.astype("datetime64[D]"), earlier.astype("datetime64[D]")
+    return later, earlier
+
+def foreign_key_violations(columns, foreign_key, parent_rows, limit):
+    """(count, samples) of non-NULL foreign key values missing from the referenced table,
+    given the parent rows KeyIndex.rows found for them"""
+    bad = np.flatnonzero((parent_rows < 0) & ~null_mask(columns[foreign_key.column]))
+    return len(bad), _samples(columns, bad, foreign_key.column, limit)
+
+def check_chunk(table, columns, start, constraints, parents, limit=5):
+    """Check rows [start, start + n) of a table that only need the chunk itself and the parent KeyIndexes.
+
+    Returns (violations, unique_keys): violations as (kind, column, detail,
+    count, samples) tuples and, for every unique column, the hashes of its
+    non-NULL values with their global row numbers, both sorted by hash.
+    Uniqueness itself needs every chunk and is settled by the caller.
+    """
+    constraints = constraints[table]
+    violations = []
+
+    def report(kind, column, detail, mask, earlier=None):
+        bad = np.flatnonzero(mask)
+        if len(bad):
+            violations.append((kind, column, detail, len(bad), _samples(columns, bad, column, limit, earlier)))
+
+    for column in constraints.not_null:
+        report("not_null", column, "NOT NULL", null_mask(columns[column]))
+    for column in constraints.expected:
+        report("missing", column, "nullable in the schema but expected to be set", null_mask(columns[column]))
+    for column, length in constraints.lengths.items():
+        values = columns[column]
+        if isinstance(values, np.ndarray) and values.dtype.kind == "S" and values.dtype.itemsize <= length:
+            continue
+        report("length", column, f"longer than {length} characters", _text_lengths(values) > length)
+    for column, (name, allowed) in constraints.enums.items():
+        report("check", column, name, _enum_mask(columns[column], allowed))
+    # Joined once per foreign key, then shared by the temporal rules that read the parent row
+    parent_rows = {}
+    for foreign_key in constraints.foreign_keys:
+        if foreign_key.ref_table in parents:
+            parent_rows[foreign_key.column] = parents[foreign_key.ref_table].rows(columns[foreign_key.column])
+            count, samples = foreign_key_violations(columns, foreign_key, parent_rows[foreign_key.column], limit)
+            if count:
+                violations.append(("foreign_key", foreign_key.column, foreign_key.name, count, samples))
+    references = {foreign_key.column: foreign_key.ref_table for foreign_key in constraints.foreign_keys}
+    for rule in constraints.temporal:
+        later = columns[rule.column]
+        if rule.via is None:
+            earlier, detail = columns[rule.earlier], f"before {rule.earlier}"
+        elif rule.via in parent_rows:
+            rows = parent_rows[rule.via]
+            earlier = parents[references[rule.via]].columns[rule.earlier][rows.clip(min=0)]
+            earlier[rows < 0] = np.datetime64("NaT")
+            detail = f"before {references[rule.via]}.{rule.earlier}"
+        else:
+            continue
+        compared_later, compared_earlier = _compared_times(later, earlier)
+        report("temporal", rule.column, detail, compared_later < compared_earlier, earlier)
+
+    unique_keys = {}
+    for column in constraints.unique:
+        values = columns[column]
+        present = np.flatnonzero(~null_mask(values))
+        hashes = key_hashes(values[present])
+        order = np.argsort(hashes, kind="stable")
+        unique_keys[column] = (hashes[order], start + present[order])
+    return violations, unique_keys
+
+# Checks set up once per pool worker by _init_validator_worker
+_validator_state = None
+
+def _init_validator_worker(constraints, parents, limit):
+    """Pool initializer: receive the constraints and the parent tables' KeyIndexes"""
+    global _validator_state
+    _validator_state = (constraints, parents, limit)
+
+def _check_chunk(table, columns, start):
+    """Pool task: check one chunk in a worker process"""
+    constraints, parents, limit = _validator_state
+    return check_chunk(table, columns, start, constraints, parents, limit)
+
+class DatasetValidator:
+    """Check generated tables against the schema as a writer: feed it chunks, then close() it.
+
+    Per-row checks (NOT NULL, lengths, CHECK enums, foreign keys and temporal
+    ordering) run chunk by chunk, on a process pool if workers > 1. Foreign
+    keys and parent timestamps are sorted-array joins against KeyIndexes of
+    the tables written before; references to tables written later (branch
+    managers) are checked on close. Unique columns are settled on close by
+    sorting the hashes collected from every chunk. Only key and
+    parent-timestamp columns are retained, so tables can be streamed through.
+    Results are in .violations after close().
+    """
+
+    def __init__(self, schema_file="banking_schema_orig.sql", workers=1, chunk_size=DEFAULT_CHUNK_SIZE, samples=5):
+        with open(schema_file, "r") as schema:
+            self.constraints = table_constraints(parse_schema(schema.read()))
+        self.retained = _retained_columns(self.constraints)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.samples = samples
+        self.rows = {}
+        self.seconds = 0.0
+        self.violations = []
+        self._found = {}
+        self._unique_keys = {}
+        self._kept = {}
+        self._indexes = {}
+        self._deferred = []
+        self._table = None
+        self._pool = None
+        self._pending = deque()
+
+    def _index(self, table):
+        """KeyIndex over the retained columns of a table written so far (rebuilt when it grew)"""
+        kept = {column: np.concatenate(parts) for column, parts in self._kept[table].items()}
+        key = next(foreign_key.ref_column for constraints in self.constraints.values()
+                   for foreign_key in constraints.foreign_keys if foreign_key.ref_table == table)
+        if table not in self._indexes or len(self._indexes[table].hashes) != len(kept[key]):
+            self._indexes[table] = KeyIndex(kept[key], kept)
+        return self._indexes[table]
+
+    def _start_table(self, table):
+        """Finish the previous table's chunks and set up checks against the tables written so far"""
+        self._drain()
+        parents = {parent: self._index(parent) for parent in self._kept}
+        if self.workers > 1:
+            self._pool = multiprocessing.Pool(self.workers, initializer=_init_validator_worker,
+                                              initargs=(self.constraints, parents, self.samples))
+        self._parents = parents
+        self._table = table
+
+    def _drain(self, keep=0):
+        """Merge finished pool results until at most keep are still in flight"""
+        while len(self._pending) > keep:
+            self._merge(self._table, *self._pending.popleft().get())
+        if not keep and self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _merge(self, table, violations, unique_keys):
+        for kind, column, detail, count, samples in violations:
+            found = self._found.setdefault((table, kind, column, detail), [0, []])
+            found[0] += count
+            found[1].extend(samples[:self.samples - len(found[1])])
+        for column, keys in unique_keys.items():
+            self._unique_keys.setdefault((table, column), []).append(keys)
+
+    def write(self, table, chunk):
+        started = time.perf_counter()
+        columns = chunk if isinstance(chunk, dict) else records_to_columns(table, chunk)
+        count = len(next(iter(columns.values())))
+        if table != self._table:
+            self._start_table(table)
+        start = self.rows.get(table, 0)
+        # References to tables not written yet can only be checked at the end
+        for foreign_key in self.constraints[table].foreign_keys:
+            if foreign_key.ref_table not in self._parents:
+                self._deferred.append((foreign_key, {"id": columns["id"], foreign_key.column:
+                                                     columns[foreign_key.column]}))
+        if table in self.retained:
+            for column in self.retained[table]:
+                self._kept.setdefault(table, {}).setdefault(column, []).append(columns[column])
+
+        for offset in range(0, count, self.chunk_size):
+            piece = {name: values[offset:offset + self.chunk_size] for name, values in columns.items()}
+            if self._pool is None:
+                self._merge(table, *check_chunk(table, piece, start + offset, self.constraints, self._parents,
+                                                self.samples))
+                continue
+            # Keep a bounded number of chunks in flight so memory stays flat
+            self._drain(keep=2 * self.workers)
+            self._pending.append(self._pool.apply_async(_check_chunk, (table, piece, start + offset)))
+        self.rows[table] = start + count
+        self.seconds += time.perf_counter() - started
+
+    def _check_unique(self, table, column):
+        """Rows repeating an earlier non-NULL value of a unique column, from the chunks' sorted hashes"""
+        runs = self._unique_keys.pop((table, column))
+        hashes = np.concatenate([run[0] for run in runs])
+        rows = np.concatenate([run[1] for run in runs])
+        # Each chunk's run is already sorted, so the stable (merge) sort mostly merges runs
+        order = np.argsort(hashes, kind="stable")
+        hashes, rows = hashes[order], rows[order]
+        repeated = np.flatnonzero(hashes[1:] == hashes[:-1])
+        if len(repeated):
+            # Row numbers count from 1 in the order the table was written
+            samples = [f"row {rows[i + 1] + 1} = row {rows[i] + 1}" for i in repeated[:self.samples].tolist()]
+            self._found[table, "unique", column, "UNIQUE"] = [len(repeated), samples]
+
+    def close(self):
+        started = time.perf_counter()
+        self._drain()
+        for foreign_key, columns in self._deferred:
+            if foreign_key.ref_table not in self._kept:
+                continue
+            parent_rows = self._index(foreign_key.ref_table).rows(columns[foreign_key.column])
+            count, samples = foreign_key_violations(columns, foreign_key, parent_rows, self.samples)
+            if count:
+                self._merge(foreign_key.table, [("foreign_key", foreign_key.column, foreign_key.name, count,
+                                                 samples)], {})
+        for table, column in list(self._unique_keys):
+            self._check_unique(table, column)
+        self.violations = [Violation(kind, table, column, detail, count, samples)
+                           for (table, kind, column, detail), (count, samples) in self._found.items()]
+        self.violations.sort(key=lambda v: (TABLES.index(v.table) if v.table in TABLES else len(TABLES),
+                                            KINDS.index(v.kind), v.column))
+        self.seconds += time.perf_counter() - started
+
+def validate_generator(generator, schema_file="banking_schema_orig.sql", workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                       samples=5):
+    """Validate the tables a generator holds in memory and return the violations"""
+    validator = DatasetValidator(schema_file, workers, chunk_size, samples)
+    generator.write_tables(validator)
+    return validator.violations
+
+def print_violations(violations, rows, seconds):
+    total = sum(rows.values())
+    print(f"\nValidated {total} rows in {seconds:.2f}s ({total / seconds if seconds else 0.0:,.0f} rows/sec)")
+    if not violations:
+        print("No violations found")
+        return
+    print(f"\n{'Table':<14}{'Kind':<13}{'Column':<18}{'Rows':>10}  Detail")
+    for violation in violations:
+        print(f"{violation.table:<14}{violation.kind:<13}{violation.column:<18}{violation.count:>10}  "
+              f"{violation.detail}")
+        for sample in violation.samples:
+            print(f"{'':<14}{'':<13}{'':<18}{'':>10}    e.g. {sample}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate banking test data and check it against the schema's "
+                                                 "constraints, foreign keys and temporal ordering")
+    parser.add_argument("--schema", default="banking_schema_orig.sql")
+    parser.add_argument("--row-path", action="store_true",
+                        help="validate row-by-row generated tables instead of streamed vectorized chunks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reference-time", type=datetime.fromisoformat, default=FIXTURE_REFERENCE_TIME)
+    parser.add_argument("--transaction-skew", type=float, default=0.0)
+    parser.add_argument("--ledger", action="store_true", help="generate transactions as account ledgers")
+    parser.add_argument("--pool-cache", help="value pool cache directory")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per generated and checked chunk")
+    parser.add_argument("--generator-workers", type=int, default=1, help="generator processes when streaming")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="validator processes")
+    parser.add_argument("--samples", type=int, default=5, help="sample rows reported per violation")
+    parser.add_argument("--output", help="write the violations as JSON to this file")
+    for table in TABLES:
+        parser.add_argument(f"--{table}", type=int, default=DEFAULT_COUNTS[table], help=f"number of {table}")
+    args = parser.parse_args()
+
+    counts = {table: getattr(args, table) for table in TABLES}
+    generator = BankingDataGenerator(seed=args.seed, reference_time=args.reference_time,
+                                     transaction_skew=args.transaction_skew, pool_cache_dir=args.pool_cache,
+                                     ledger=args.ledger)
+    validator = DatasetValidator(args.schema, args.workers, args.chunk_size, args.samples)
+    started = time.perf_counter()
+    if args.row_path:
+        generator.generate_all_data(counts=counts)
+        generator.write_tables(validator)
+    else:
+        generator.stream_to([validator], counts, args.chunk_size, args.generator_workers)
+    print(f"Generated and validated in {time.perf_counter() - started:.2f}s")
+    print_violations(validator.violations, validator.rows, validator.seconds)
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump({"rows": validator.rows, "seconds": validator.seconds,
+                       "violations": [violation._asdict() for violation in validator.violations]}, out, indent=2)
+        print(f"\nViolations written to {args.output}")
+    if validator.violations:
+        sys.exit(1)
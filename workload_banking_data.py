@@ -0,0 +1,237 @@
+import argparse
+import json
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+
+from benchmark_banking_data import DEFAULT_SIZES, scaled_counts
+from load_banking_data import (
+    FIXTURE_REFERENCE_TIME, FixtureCache, bulk_load, cached_database,
+)
+
+# load_banking_data puts data/ on sys.path
+from banking_test_data_generator import BankingDataGenerator, DEFAULT_CHUNK_SIZE  # noqa: E402
+
+# A workload query: SQL with ? placeholders and a function drawing its parameters
+WorkloadQuery = namedtuple("WorkloadQuery", "sql params")
+
+# Relative frequency of each query in the default mix
+DEFAULT_MIX = {
+    "account_statement": 40,
+    "customer_accounts": 20,
+    "daily_volume": 10,
+    "pending_transactions": 10,
+    "top_customers": 10,
+    "branch_balances": 10,
+}
+
+PERCENTILES = [50, 95, 99]
+
+class WorkloadParams:
+    """Random query parameters drawn from the ids actually present in the database"""
+
+    def __init__(self, conn, seed=42, now=FIXTURE_REFERENCE_TIME):
+        self.random = random.Random(seed)
+        self.now = now
+        self.account_ids = [row[0] for row in conn.execute("SELECT id FROM accounts")]
+        self.customer_ids = [row[0] for row in conn.execute("SELECT id FROM customers")]
+
+    def _window(self, days):
+        """A days-long [start, end] window inside the last year, as SQL timestamps"""
+        start = self.now - timedelta(days=self.random.randint(days, 365))
+        return start.strftime("%Y-%m-%d %H:%M:%S"), (start + timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+    def account_statement(self):
+        return (self.random.choice(self.account_ids),) + self._window(90)
+
+    def customer_accounts(self):
+        return (self.random.choice(self.customer_ids),)
+
+    def daily_volume(self):
+        return self._window(7)
+
+    def since(self):
+        return (self._window(30)[0],)
+
+    def none(self):
+        return ()
+
+def workload_queries(params):
+    """The banking queries the harness can mix, by name"""
+    return {
+        # One account's transactions in a date range, newest last
+        "account_statement": WorkloadQuery(
+            "SELECT transaction_date, amount, type, status, description FROM transactions "
+            "WHERE account_id = ? AND transaction_date BETWEEN ? AND ? ORDER BY transaction_date",
+            params.account_statement),
+        # A customer's accounts and balances
+        "customer_accounts": WorkloadQuery(
+            "SELECT id, type, status, balance FROM accounts WHERE customer_id = ?",
+            params.customer_accounts),
+        # Transaction count and net amount per day over a week
+        "daily_volume": WorkloadQuery(
+            "SELECT date(transaction_date), COUNT(*), SUM(amount) FROM transactions "
+            "WHERE transaction_date BETWEEN ? AND ? GROUP BY date(transaction_date)",
+            params.daily_volume),
+        # Oldest transactions still pending
+        "pending_transactions": WorkloadQuery(
+            "SELECT id, account_id, amount, transaction_date FROM transactions "
+            "WHERE status = 'pending' ORDER BY transaction_date LIMIT 100",
+            params.none),
+        # Customers with the largest completed volume since a date
+        "top_customers": WorkloadQuery(
+            "SELECT c.id, c.first_name, c.last_name, SUM(ABS(t.amount)) AS volume, COUNT(*) "
+            "FROM transactions t JOIN accounts a ON a.id = t.account_id JOIN customers c ON c.id = a.customer_id "
+            "WHERE t.transaction_date >= ? AND t.status = 'completed' "
+            "GROUP BY c.id, c.first_name, c.last_name ORDER BY volume DESC LIMIT 10",
+            params.since),
+        # Active account count and total balance per branch
+        "branch_balances": WorkloadQuery(
+            "SELECT b.id, b.name, COUNT(*), SUM(a.balance) FROM accounts a JOIN branches b ON b.id = a.branch_id "
+            "WHERE a.status = 'active' GROUP BY b.id, b.name ORDER BY SUM(a.balance) DESC",
+            params.none),
+    }
+
+def query_plan(conn, sql, params):
+    """EXPLAIN QUERY PLAN detail lines, indented by depth"""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    depth = {0: 0}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, 0) + 1
+        lines.append("  " * (depth[node] - 1) + detail)
+    return lines
+
+def plan_scans(plan):
+    """Plan lines that walk a whole table or index (SQLite "SCAN ..." rather than "SEARCH ...")"""
+    return [line.strip() for line in plan if line.strip().startswith("SCAN ")]
+
+def run_workload(conn, mix, queries=1000, seed=42, warmup=True):
+    """Run queries drawn from mix (name -> weight) and return per-query latency stats and plans"""
+    params = WorkloadParams(conn, seed)
+    available = workload_queries(params)
+    unknown = set(mix) - set(available)
+    if unknown:
+        raise ValueError(f"Unknown workload queries: {', '.join(sorted(unknown))}")
+    names = [name for name in mix if mix[name] > 0]
+    if warmup:
+        for name in names:
+            conn.execute(available[name].sql, available[name].params()).fetchall()
+
+    latencies = {name: [] for name in names}
+    rows = {name: 0 for name in names}
+    for name in params.random.choices(names, [mix[name] for name in names], k=queries):
+        query = available[name]
+        args = query.params()
+        started = time.perf_counter()
+        rows[name] += len(conn.execute(query.sql, args).fetchall())
+        latencies[name].append(time.perf_counter() - started)
+
+    results = {}
+    for name in names:
+        query = available[name]
+        plan = query_plan(conn, query.sql, query.params())
+        timings = np.array(latencies[name]) * 1000
+        results[name] = {
+            "count": len(timings),
+            "mean_ms": float(timings.mean()) if len(timings) else None,
+            **{f"p{p}_ms": float(np.percentile(timings, p)) if len(timings) else None for p in PERCENTILES},
+            "rows": rows[name] / len(timings) if len(timings) else 0.0,
+            "plan": plan,
+            "scans": plan_scans(plan),
+        }
+    return results
+
+def print_workload(transactions, results, show_plans=False):
+    print(f"\n== {transactions} transactions")
+    print(f"{'Query':<22}{'Count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Rows':>9}  Scans")
+    for name, result in results.items():
+        if not result["count"]:
+            continue
+        print(f"{name:<22}{result['count']:>7}{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+              f"{result['p99_ms']:>10.3f}{result['rows']:>9.1f}  {'; '.join(result['scans']) or '-'}")
+    if show_plans:
+        for name, result in results.items():
+            print(f"\n{name}:")
+            for line in result["plan"]:
+                print(f"  {line}")
+
+def compare_to_baseline(runs, baseline, tolerance):
+    """Report changed query plans and p95 regressions beyond tolerance; return how many were found"""
+    previous = {run["transactions"]: run["queries"] for run in baseline["runs"]}
+    problems = 0
+    for run in runs:
+        for name, result in run["queries"].items():
+            before = previous.get(run["transactions"], {}).get(name)
+            if before is None:
+                continue
+            if before["plan"] != result["plan"]:
+                problems += 1
+                print(f"\nPLAN CHANGED: {name} @ {run['transactions']}")
+                print("  before: " + "\n          ".join(before["plan"]))
+                print("  after:  " + "\n          ".join(result["plan"]))
+            if before["p95_ms"] and result["p95_ms"] and result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                problems += 1
+                print(f"REGRESSION: {name} @ {run['transactions']} p95 "
+                      f"{before['p95_ms']:.3f}ms -> {result['p95_ms']:.3f}ms")
+    return problems
+
+def parse_mix(value):
+    """'name=weight,...' into a mix dict"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a banking query workload against loaded databases")
+    parser.add_argument("--sizes", type=lambda value: [int(n) for n in value.split(",")], default=DEFAULT_SIZES,
+                        help="comma-separated transaction counts to load and query")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help=f"query weights, e.g. {','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())}")
+    parser.add_argument("--queries", type=int, default=1000, help="queries to run per size")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the data and the query parameters")
+    parser.add_argument("--schema", default="banking_schema_orig.sql")
+    parser.add_argument("--hot-indexes", action="store_true", help="load with the covering and partial indexes")
+    parser.add_argument("--fixture-cache", nargs="?", const=True,
+                        help="reuse cached databases (optionally from this directory) instead of loading every run")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--show-plans", action="store_true", help="print every EXPLAIN QUERY PLAN")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare plans and p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="p95 slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    runs = []
+    for transactions in args.sizes:
+        counts = scaled_counts(transactions)
+        print(f"\nLoading {transactions} transactions...")
+        if args.fixture_cache:
+            cache = FixtureCache() if args.fixture_cache is True else FixtureCache(args.fixture_cache)
+            conn = cached_database(":memory:", args.schema, args.seed, counts, chunk_size=args.chunk_size,
+                                   hot_indexes=args.hot_indexes, cache=cache)
+        else:
+            generator = BankingDataGenerator(seed=args.seed, reference_time=FIXTURE_REFERENCE_TIME)
+            conn, _ = bulk_load(":memory:", args.schema, generator, counts, args.chunk_size,
+                                hot_indexes=args.hot_indexes)
+        results = run_workload(conn, args.mix, args.queries, args.seed)
+        conn.close()
+        print_workload(transactions, results, args.show_plans)
+        runs.append({"transactions": transactions, "counts": counts, "queries": results})
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump({"options": {"seed": args.seed, "queries": args.queries, "mix": args.mix,
+                                   "hot_indexes": args.hot_indexes}, "runs": runs}, out, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            problems = compare_to_baseline(runs, json.load(baseline), args.tolerance)
+        if problems:
+            print(f"\n{problems} plan change(s) or regression(s) against the baseline")
+            sys.exit(1)